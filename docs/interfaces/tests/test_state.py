@@ -7,10 +7,18 @@ Knowledge Pipeline - State 模組驗收測試
     python docs/interfaces/tests/test_state.py
 """
 
+import sys
 import unittest
 from pathlib import Path
 import tempfile
 
+# 確保能找到 src 模組（從 docs/interfaces/tests/ 回到專案根目錄）
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from src.discovery import FrontmatterParser
+from src.models import PipelineStatus
+from src.state import FrontmatterReader, FrontmatterWriter
+
 
 class TestFrontmatterReader(unittest.TestCase):
     """測試 FrontmatterReader"""
@@ -52,6 +60,138 @@ class TestFrontmatterWriter(unittest.TestCase):
         pass
 
 
+class TestFrontmatterWriterRewrite(unittest.TestCase):
+    """測試 FrontmatterWriter.write 的原地覆寫與完整改寫"""
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "note.md"
+        self.writer = FrontmatterWriter()
+        self.parser = FrontmatterParser()
+    
+    def tearDown(self):
+        self._tmp.cleanup()
+    
+    def _write_raw(self, raw: bytes) -> None:
+        self.path.write_bytes(raw)
+    
+    def test_shrinking_header_is_padded_in_place(self):
+        """新 frontmatter 較短時原地覆寫並補空白，檔案大小與正文不變"""
+        self._write_raw(b"---\ntitle: a long title value\nstatus: pending\n---\n\nbody text")
+        size = self.path.stat().st_size
+        
+        self.writer.write(self.path, {"title": "short"})
+        
+        raw = self.path.read_bytes()
+        self.assertEqual(len(raw), size)
+        self.assertTrue(raw.endswith(b"\n---\n\nbody text"))
+        frontmatter, body = self.parser.parse(raw.decode("utf-8"))
+        self.assertEqual(frontmatter, {"title": "short", "status": "pending"})
+        self.assertEqual(body, "body text")
+    
+    def test_growing_header_rewrites_whole_file(self):
+        """新 frontmatter 放不下時改寫整份檔案，正文保留"""
+        self._write_raw(b"---\nstatus: pending\n---\n\nbody text")
+        
+        self.writer.write(self.path, {"source_id": "source:abc", "status": "uploaded"})
+        
+        raw = self.path.read_bytes()
+        self.assertEqual(
+            raw,
+            b"---\nstatus: uploaded\nsource_id: source:abc\n---\n\nbody text"
+        )
+    
+    def test_foreign_layout_is_rewritten_and_truncated(self):
+        """非寫入器格式（正文前後有多餘空白）時完整改寫，並截掉舊檔多出的尾端"""
+        self._write_raw(b"---\nstatus: pending\n---\n\n\n\nbody text\n\n\n\n\n\n\n\n")
+        
+        self.writer.write(self.path, {"status": "failed"})
+        
+        self.assertEqual(
+            self.path.read_bytes(),
+            b"---\nstatus: failed\n---\n\nbody text"
+        )
+    
+    def test_non_ascii_body_preserved(self):
+        """正文含多位元組字元時原地覆寫仍以 bytes 長度判斷"""
+        self._write_raw("---\ntitle: 很長的標題內容\n---\n\n正文內容".encode("utf-8"))
+        
+        self.writer.write(self.path, {"title": "短"})
+        
+        frontmatter, body = self.parser.parse(self.path.read_text(encoding="utf-8"))
+        self.assertEqual(frontmatter, {"title": "短"})
+        self.assertEqual(body, "正文內容")
+
+
+class TestFrontmatterWriterPatch(unittest.TestCase):
+    """測試 status / source_id 的 bytes 層級原地改寫"""
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "note.md"
+        self.reader = FrontmatterReader()
+        self.writer = FrontmatterWriter(reader=self.reader)
+    
+    def tearDown(self):
+        self._tmp.cleanup()
+    
+    def test_patch_shorter_value_in_place(self):
+        """新值較短時補空白原地改寫"""
+        raw = b"---\nstatus: pending\nsource_id: null\n---\n\nbody"
+        self.path.write_bytes(raw)
+        
+        self.assertTrue(self.writer.patch_status(self.path, PipelineStatus.FAILED))
+        
+        patched = self.path.read_bytes()
+        self.assertEqual(len(patched), len(raw))
+        self.assertEqual(patched, b"---\nstatus: failed \nsource_id: null\n---\n\nbody")
+        self.assertEqual(self.reader.read(self.path)["status"], "failed")
+    
+    def test_patch_keeps_quotes(self):
+        """帶引號的值改寫後仍保留引號"""
+        self.path.write_bytes(b"---\nstatus: 'pending'\n---\n\nbody")
+        
+        self.assertTrue(self.writer.patch_status(self.path, PipelineStatus.APPROVED))
+        
+        self.assertEqual(self.reader.read(self.path)["status"], "approved")
+    
+    def test_patch_refuses_longer_value(self):
+        """新值較長時不改寫檔案"""
+        raw = b"---\nstatus: failed\n---\n\nbody"
+        self.path.write_bytes(raw)
+        
+        self.assertFalse(self.writer.patch_status(self.path, PipelineStatus.UPLOADED))
+        self.assertEqual(self.path.read_bytes(), raw)
+    
+    def test_patch_refuses_special_scalars(self):
+        """會被 YAML 解讀為非字串的值（null、yes 等）交由完整寫入處理"""
+        raw = b"---\nsource_id: source:abcdef\n---\n\nbody"
+        self.path.write_bytes(raw)
+        
+        for value in ("null", "yes", "Off", "a b", "1abc"):
+            with self.subTest(value=value):
+                self.assertFalse(self.writer.patch_source_id(self.path, value))
+                self.assertEqual(self.path.read_bytes(), raw)
+    
+    def test_patch_refuses_missing_field(self):
+        """欄位不存在或無 frontmatter 時不改寫"""
+        raw = b"---\ntitle: x\n---\n\nstatus: pending"
+        self.path.write_bytes(raw)
+        
+        self.assertFalse(self.writer.patch_status(self.path, PipelineStatus.FAILED))
+        self.assertEqual(self.path.read_bytes(), raw)
+    
+    def test_write_source_id_falls_back_to_full_write(self):
+        """原地改寫被拒時 write_source_id 改用完整寫入"""
+        self.path.write_bytes(b"---\nstatus: uploaded\nsource_id: null\n---\n\nbody")
+        
+        self.writer.write_source_id(self.path, "source:abcdef")
+        
+        frontmatter = self.reader.read(self.path)
+        self.assertEqual(frontmatter["source_id"], "source:abcdef")
+        self.assertEqual(frontmatter["status"], "uploaded")
+
+
 class TestIdempotencyChecker(unittest.TestCase):
     """測試 IdempotencyChecker"""
     
@@ -8,8 +8,21 @@ Knowledge Pipeline - Uploader 模組驗收測試
     python docs/interfaces/tests/test_uploader.py
 """
 
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+# 確保能找到 src 模組（從 docs/interfaces/tests/ 回到專案根目錄）
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from src import uploader
+from src.models import SourceCreateRequest
 
 
 class TestOpenNotebookClient(unittest.TestCase):
@@ -78,6 +91,360 @@ class TestUploaderService(unittest.TestCase):
         pass
 
 
+class TestTransformationResolution(unittest.TestCase):
+    """測試 transformation 自動選擇的共用查詢"""
+    
+    BASE_URL = "http://transformations.test"
+    
+    def setUp(self):
+        self._clear_cache()
+    
+    def tearDown(self):
+        self._clear_cache()
+    
+    def _clear_cache(self):
+        with uploader._transformation_cache_lock:
+            uploader._transformation_cache.pop(self.BASE_URL, None)
+            uploader._transformation_pending.pop(self.BASE_URL, None)
+    
+    def _client(self, get_transformations):
+        return SimpleNamespace(
+            config=SimpleNamespace(base_url=self.BASE_URL),
+            get_transformations=get_transformations,
+        )
+    
+    def _start_callers(self, client, count, results, errors):
+        """以 count 個執行緒呼叫，結果與例外分別附加到 results、errors"""
+        def call():
+            try:
+                results.append(uploader._resolve_transformation_ids(client))
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads
+    
+    def test_priority_order(self):
+        """測試依優先順序選擇，並快取結果"""
+        calls = []
+        
+        def get_transformations():
+            calls.append(1)
+            return [
+                {"id": "t-dense", "name": "Dense Summary"},
+                {"id": "t-key", "name": "Key Insights"},
+            ]
+        
+        client = self._client(get_transformations)
+        self.assertEqual(uploader._resolve_transformation_ids(client), ["t-key"])
+        self.assertEqual(uploader._resolve_transformation_ids(client), ["t-key"])
+        self.assertEqual(len(calls), 1)
+    
+    def test_concurrent_callers_share_one_query(self):
+        """測試同時到達的呼叫端只發出一次查詢"""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        
+        def get_transformations():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return [{"id": "t-first", "name": "Custom"}]
+        
+        client = self._client(get_transformations)
+        results, errors = [], []
+        threads = self._start_callers(client, 1, results, errors)
+        self.assertTrue(started.wait(5))
+        threads += self._start_callers(client, 4, results, errors)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(errors, [])
+        self.assertEqual(results, [["t-first"]] * 5)
+    
+    def test_malformed_response_releases_waiters(self):
+        """測試回應格式不符時，等待中的呼叫端收到例外而非無限等待"""
+        started = threading.Event()
+        release = threading.Event()
+        
+        def get_transformations():
+            started.set()
+            release.wait(5)
+            # 名稱字串而非物件，選擇時 t.get 會拋出 AttributeError
+            return ["Key Insights"]
+        
+        client = self._client(get_transformations)
+        results, errors = [], []
+        threads = self._start_callers(client, 1, results, errors)
+        self.assertTrue(started.wait(5))
+        threads += self._start_callers(client, 3, results, errors)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+        
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 4)
+        self.assertTrue(all(isinstance(e, AttributeError) for e in errors))
+        self.assertNotIn(self.BASE_URL, uploader._transformation_pending)
+        self.assertNotIn(self.BASE_URL, uploader._transformation_cache)
+
+
+class TestConcurrencyControl(unittest.TestCase):
+    """測試批次上傳的並行數控制（AIMD 控制器與許可閘門）"""
+    
+    def test_additive_increase_up_to_ceiling(self):
+        """測試耗時未上升時逐段加一，且不超過上限"""
+        controller = uploader._ConcurrencyController(ceiling=4, initial=2)
+        self.assertEqual(controller.update(100.0, False), 3)
+        self.assertEqual(controller.update(100.0, False), 4)
+        self.assertEqual(controller.update(100.0, False), 4)
+    
+    def test_hold_when_slower(self):
+        """測試耗時明顯上升時維持並行數"""
+        controller = uploader._ConcurrencyController(ceiling=8, initial=2)
+        controller.update(100.0, False)
+        self.assertEqual(controller.update(500.0, False), 3)
+    
+    def test_halve_on_rate_limit(self):
+        """測試遇到 429 時並行數減半，最低為 1"""
+        controller = uploader._ConcurrencyController(ceiling=16, initial=8)
+        self.assertEqual(controller.update(100.0, True), 4)
+        self.assertEqual(controller.update(100.0, True), 2)
+        self.assertEqual(controller.update(100.0, True), 1)
+        self.assertEqual(controller.update(100.0, True), 1)
+    
+    def test_gate_limits_active_permits(self):
+        """測試閘門同時放行的數量不超過上限，調高上限後放行更多"""
+        gate = uploader._PermitGate(2)
+        lock = threading.Lock()
+        active = peak = 0
+        release = threading.Event()
+        
+        def hold():
+            nonlocal active, peak
+            with gate:
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                release.wait(5)
+                with lock:
+                    active -= 1
+        
+        threads = [threading.Thread(target=hold) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        self.assertEqual(peak, 2)
+        
+        gate.resize(4)
+        time.sleep(0.05)
+        self.assertEqual(peak, 4)
+        
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(active, 0)
+
+
+class TestUploadBatch(unittest.TestCase):
+    """測試 UploaderService.upload_batch"""
+    
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.pool_maxsize = 4
+        self.client.rate_limited_count = 0
+        self.service = uploader.UploaderService(self.client, auto_insights=False)
+    
+    def tearDown(self):
+        self.service.close()
+    
+    def test_notebook_resolution_failure_falls_back_per_item(self):
+        """測試批次解析 Notebook 失敗時改為逐筆上傳，不中斷整批"""
+        self.service.resolve_notebooks = MagicMock(side_effect=RuntimeError("down"))
+        self.service.upload = MagicMock(return_value="source:1")
+        
+        results = self.service.upload_batch([(object(), "nb-a"), (object(), "nb-b")])
+        
+        self.assertTrue(all(result.success for result in results))
+        for call in self.service.upload.call_args_list:
+            self.assertIsNone(call.kwargs["notebook_id"])
+    
+    def test_initial_concurrency_is_gated(self):
+        """測試第一段上傳的並行數受控制器初始值限制"""
+        lock = threading.Lock()
+        active = peak = 0
+        
+        def upload(*args, **kwargs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return "source:1"
+        
+        self.service.resolve_notebooks = MagicMock(return_value={"nb": "notebook:1"})
+        self.service.upload = upload
+        
+        results = self.service.upload_batch([(object(), "nb")] * 4)
+        
+        self.assertEqual([result.source_id for result in results], ["source:1"] * 4)
+        self.assertEqual(peak, 2)
+
+
+class TestUploadJournal(unittest.TestCase):
+    """測試 UploadJournal"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "journal" / "uploads.sqlite3"
+        self.journal = uploader.UploadJournal(self.path)
+    
+    def tearDown(self):
+        self.journal.close()
+        self.temp_dir.cleanup()
+    
+    def _row(self, content_hash, notebook):
+        """直接讀取資料庫中的 (state, error)"""
+        conn = sqlite3.connect(str(self.path))
+        try:
+            return conn.execute(
+                "SELECT state, error FROM uploads WHERE content_hash = ? AND notebook = ?",
+                (content_hash, notebook)
+            ).fetchone()
+        finally:
+            conn.close()
+    
+    def test_pending_then_committed(self):
+        """測試 pending 不視為完成，committed 後可查回 Source ID"""
+        self.journal.mark_pending("hash-1", "nb")
+        self.assertEqual(self._row("hash-1", "nb"), ("pending", None))
+        self.assertIsNone(self.journal.committed_source_id("hash-1", "nb"))
+        
+        self.journal.mark_committed("hash-1", "nb", "source:1")
+        self.assertEqual(self._row("hash-1", "nb"), ("committed", None))
+        self.assertEqual(self.journal.committed_source_id("hash-1", "nb"), "source:1")
+        
+        # 同內容上傳到其他 Notebook 不共用
+        self.assertIsNone(self.journal.committed_source_id("hash-1", "other"))
+    
+    def test_failed_is_not_committed(self):
+        """測試失敗的項目不會被略過"""
+        self.journal.mark_pending("hash-2", "nb")
+        self.journal.mark_failed("hash-2", "nb", "boom")
+        self.assertEqual(self._row("hash-2", "nb"), ("failed", "boom"))
+        self.assertIsNone(self.journal.committed_source_id("hash-2", "nb"))
+    
+    def test_committed_survives_reopen(self):
+        """測試重新開啟後仍可查回已完成的上傳"""
+        self.journal.mark_committed("hash-3", "nb", "source:3")
+        self.journal.close()
+        
+        self.journal = uploader.UploadJournal(self.path)
+        self.assertEqual(self.journal.committed_source_id("hash-3", "nb"), "source:3")
+
+
+class TestUploadSteps(unittest.TestCase):
+    """測試 UploaderService.upload 依服務端能力選擇的步驟"""
+    
+    def _service(self, supports_topics_on_create, embeds_on_create=False):
+        client = MagicMock()
+        client.pool_maxsize = 4
+        client.supports_topics_on_create = supports_topics_on_create
+        client.embeds_on_create = embeds_on_create
+        client.create_source.return_value.id = "source:1"
+        builder = MagicMock()
+        builder.build_create_request.return_value = SourceCreateRequest(
+            type="text", title="title", content="content"
+        )
+        service = uploader.UploaderService(client, builder=builder, auto_insights=False)
+        self.addCleanup(service.close)
+        return service, client, builder
+    
+    def test_topics_updated_after_create(self):
+        """測試服務端不接受建立時帶入 topics 時，建立後另行更新"""
+        service, client, builder = self._service(supports_topics_on_create=False)
+        
+        self.assertEqual(service.upload(object(), "nb", notebook_id="notebook:1"), "source:1")
+        
+        self.assertFalse(builder.build_create_request.call_args.kwargs["include_topics"])
+        client.update_source_topics.assert_called_once()
+        client.link_source_to_notebook.assert_called_once_with("notebook:1", "source:1")
+        client.trigger_embedding.assert_called_once_with("source:1")
+    
+    def test_topics_sent_on_create(self):
+        """測試服務端接受建立時帶入 topics 時，略過更新請求"""
+        service, client, builder = self._service(supports_topics_on_create=True)
+        
+        self.assertEqual(service.upload(object(), "nb", notebook_id="notebook:1"), "source:1")
+        
+        self.assertTrue(builder.build_create_request.call_args.kwargs["include_topics"])
+        client.update_source_topics.assert_not_called()
+        client.link_source_to_notebook.assert_called_once_with("notebook:1", "source:1")
+        client.trigger_embedding.assert_called_once_with("source:1")
+    
+    def test_embed_on_create(self):
+        """測試服務端於建立時嵌入時，略過觸發嵌入的請求"""
+        service, client, builder = self._service(
+            supports_topics_on_create=True, embeds_on_create=True
+        )
+        
+        service.upload(object(), "nb", notebook_id="notebook:1")
+        
+        self.assertTrue(builder.build_create_request.call_args.kwargs["embed"])
+        client.trigger_embedding.assert_not_called()
+    
+    def test_embed_on_create_requires_topics_on_create(self):
+        """測試 topics 需另行更新時，即使服務端可於建立時嵌入也不使用"""
+        service, client, builder = self._service(
+            supports_topics_on_create=False, embeds_on_create=True
+        )
+        
+        service.upload(object(), "nb", notebook_id="notebook:1")
+        
+        self.assertFalse(builder.build_create_request.call_args.kwargs["embed"])
+        client.trigger_embedding.assert_called_once_with("source:1")
+
+
+class TestUploadResult(unittest.TestCase):
+    """測試 UploadResult"""
+    
+    def test_error_from_constructor(self):
+        """測試可直接傳入錯誤訊息，且相等比較與 repr 皆包含 error"""
+        result = uploader.UploadResult(success=False, error="x")
+        self.assertEqual(result.error, "x")
+        self.assertEqual(result, uploader.UploadResult(success=False, error="x"))
+        self.assertNotEqual(result, uploader.UploadResult(success=False, error="y"))
+        self.assertIn("error='x'", repr(result))
+    
+    def test_error_formatted_lazily_from_exception(self):
+        """測試只保存例外時，讀取 error 才格式化"""
+        exc = MagicMock(spec=Exception)
+        exc.__str__.return_value = "boom"
+        result = uploader.UploadResult(success=False, error_code="UPLOAD_ERROR", exc=exc)
+        exc.__str__.assert_not_called()
+        
+        self.assertEqual(result.error, "boom")
+        self.assertEqual(result.error, "boom")
+        exc.__str__.assert_called_once()
+        self.assertEqual(
+            result,
+            uploader.UploadResult(success=False, error="boom", error_code="UPLOAD_ERROR")
+        )
+    
+    def test_slots(self):
+        """測試不建立實例 __dict__"""
+        self.assertFalse(hasattr(uploader.UploadResult(success=True), "__dict__"))
+
+
 class TestAPIRetryStrategy(unittest.TestCase):
     """測試 API 重試策略"""
     
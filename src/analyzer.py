@@ -7,6 +7,9 @@ Knowledge Pipeline - Analyzer 模組
 from __future__ import annotations
 
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -222,6 +225,44 @@ class StructuredSegmentation:
         return best_pos
 
 
+# ============================================================================
+# Call Rate Limiter
+# ============================================================================
+
+class CallIntervalLimiter:
+    """
+    呼叫間隔限制器
+    
+    確保相鄰兩次 LLM 呼叫的「開始時間」至少相隔 interval 秒。
+    僅在呼叫過於密集時才等待；若前一次呼叫本身已耗時超過 interval，則不等待。
+    可在多執行緒中共用。
+    """
+    
+    def __init__(self, interval: float = 1.0):
+        """
+        初始化限制器
+        
+        Args:
+            interval: 最小呼叫間隔（秒），0 表示不限制
+        """
+        self.interval = interval
+        self._next_allowed = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self) -> None:
+        """等待直到允許下一次呼叫"""
+        if self.interval <= 0:
+            return
+        
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + self.interval
+        
+        if delay > 0:
+            time.sleep(delay)
+
+
 # ============================================================================
 # Analyzer Service
 # ============================================================================
@@ -367,48 +408,56 @@ class AnalyzerService:
         prompt_template: str | None = None,
         output_dir: Path | None = None,
         progress_callback: Callable[[int, int, str], None] | None = None,
-        delay_between_calls: float = 1.0
+        delay_between_calls: float = 1.0,
+        max_concurrent: int = 1
     ) -> list[AnalyzedTranscript]:
         """
         批次分析多個轉錄檔案
         
         ⚠️ 注意：因 LLM 通常有 rate limiting（如 Gemini 免費版 1000 calls/day），
-        建議批次處理時加入適當延遲（預設每個檔案間隔 1 秒）。
+        相鄰兩次呼叫的開始時間至少間隔 delay_between_calls 秒（預設 1 秒）。
+        LLM 呼叫以等待外部程序為主，可透過 max_concurrent 同時執行多個分析。
         
         Args:
             transcripts: 待分析的轉錄檔案列表
             prompt_template: 使用的 prompt template 名稱
             output_dir: 輸出目錄
             progress_callback: 進度回呼函數 (current, total, status) -> None
-            delay_between_calls: 每次呼叫間隔秒數（避免 rate limit）
+            delay_between_calls: 相鄰呼叫的最小間隔秒數（避免 rate limit）
+            max_concurrent: 同時分析的檔案數（1 表示依序處理）
         
         Returns:
-            分析成功的 AnalyzedTranscript 列表
+            分析成功的 AnalyzedTranscript 列表（順序與輸入相同）
         """
-        import time
-        
-        results = []
         total = len(transcripts)
         template = prompt_template or self.default_template
+        limiter = CallIntervalLimiter(delay_between_calls)
         
-        for i, transcript in enumerate(transcripts, 1):
+        def analyze_one(i: int, transcript: TranscriptFile) -> AnalyzedTranscript | None:
             try:
                 if progress_callback:
                     progress_callback(i, total, f"分析中: {transcript.metadata.title[:50]}...")
                 
-                result = self.analyze(transcript, template, output_dir)
-                if result:
-                    results.append(result)
-                    
-                    # 避免 rate limit
-                    if i < total and delay_between_calls > 0:
-                        time.sleep(delay_between_calls)
-                        
+                # 避免 rate limit
+                limiter.wait()
+                return self.analyze(transcript, template, output_dir)
+                
             except AnalysisFailedError as e:
                 # 記錄錯誤但繼續處理
                 if progress_callback:
                     progress_callback(i, total, f"失敗: {e}")
-                continue
+                return None
+        
+        if max_concurrent <= 1 or total <= 1:
+            outcomes = [
+                analyze_one(i, transcript)
+                for i, transcript in enumerate(transcripts, 1)
+            ]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_concurrent, total)) as executor:
+                outcomes = list(executor.map(analyze_one, range(1, total + 1), transcripts))
+        
+        results = [result for result in outcomes if result]
         
         if progress_callback:
             progress_callback(total, total, f"完成: {len(results)}/{total}")
@@ -440,7 +489,7 @@ class AnalyzerService:
             channel=transcript.metadata.channel,
             title=transcript.metadata.title,
             content=pure_content,
-            published_at=transcript.metadata.published_at.isoformat(),
+            published_at=transcript.metadata.published_iso,
             word_count=transcript.metadata.word_count,
             file_path=transcript.path,
             video_id=transcript.metadata.video_id,
@@ -488,14 +537,14 @@ class AnalyzerService:
             輸出檔案路徑
         """
         # 從 published_at 提取年月
-        year_month = transcript.metadata.published_at.strftime("%Y-%m")
+        year_month = transcript.metadata.published_ym
         
         # 產生 slug（標題的簡化版本）
         slug = self._slugify(transcript.metadata.title, max_length=50)
         
         # 檔名格式
         filename = (
-            f"{transcript.metadata.published_at.strftime('%Y%m%d')}"
+            f"{transcript.metadata.published_ymd}"
             f"_{transcript.metadata.video_id}"
             f"_{slug}"
             f"_analyzed.md"
@@ -601,7 +650,7 @@ class AnalyzerService:
             "channel": original.channel,
             "video_id": original.video_id,
             "title": original.title,
-            "published_at": original.published_at.isoformat(),
+            "published_at": original.published_iso,
             "duration": original.duration,
             "word_count": original.word_count,
             
@@ -633,7 +682,7 @@ class AnalyzerService:
         
         # 處理中繼資料
         frontmatter["analyzed_by"] = processing.analyzed_by
-        frontmatter["analyzed_at"] = processing.analyzed_at.isoformat()
+        frontmatter["analyzed_at"] = processing.analyzed_iso
         frontmatter["pipeline_version"] = processing.pipeline_version
         frontmatter["source_path"] = processing.source_path
         
@@ -6,6 +6,7 @@ Knowledge Pipeline - 配置管理模組
 
 from __future__ import annotations
 
+import functools
 import os
 from pathlib import Path
 from typing import Any
@@ -13,6 +14,11 @@ from urllib.parse import urlparse
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:  # 未安裝 libyaml 時退回純 Python 版本
+    from yaml import SafeLoader as YamlSafeLoader
+
 from src.models import (
     PipelineConfig,
     OpenNotebookConfig,
@@ -81,6 +87,50 @@ class EnvironmentProvider:
         return os.environ.get(self.ENV_INTERMEDIATE_PATH)
 
 
+# ============================================================================
+# YAML 快取
+# ============================================================================
+
+
+@functools.lru_cache(maxsize=4)
+def _load_yaml_cached(resolved_path: str, mtime_ns: int) -> Any:
+    """
+    解析 YAML 檔案（依絕對路徑 + mtime 快取）
+    
+    mtime_ns 僅作為快取鍵的一部分，檔案被修改後會自動重新解析。
+    回傳值為共享物件，呼叫端不可修改。
+    
+    Args:
+        resolved_path: 檔案絕對路徑
+        mtime_ns: 檔案修改時間（奈秒）
+    
+    Returns:
+        YAML 解析結果
+    """
+    with open(resolved_path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=YamlSafeLoader)
+
+
+def _read_yaml(path: Path) -> Any:
+    """
+    讀取 YAML 檔案（同一行程內相同檔案只解析一次）
+    
+    Args:
+        path: YAML 檔案路徑
+    
+    Returns:
+        YAML 解析結果
+    
+    Raises:
+        ConfigValidationError: YAML 格式錯誤
+    """
+    resolved = path.resolve()
+    try:
+        return _load_yaml_cached(str(resolved), resolved.stat().st_mtime_ns)
+    except yaml.YAMLError as e:
+        raise ConfigValidationError(f"YAML 解析錯誤: {e}") from e
+
+
 # ============================================================================
 # 配置載入器
 # ============================================================================
@@ -119,11 +169,7 @@ class ConfigLoader:
         if not config_path.exists():
             raise ConfigNotFoundError(f"配置文件不存在: {config_path}")
         
-        try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
-        except yaml.YAMLError as e:
-            raise ConfigValidationError(f"YAML 解析錯誤: {e}") from e
+        data = _read_yaml(config_path)
         
         # 解析路徑
         transcriber_output = Path(data["paths"]["transcriber_output"])
@@ -138,6 +184,10 @@ class ConfigLoader:
         if env_intermediate:
             intermediate = Path(env_intermediate)
         
+        # 上傳日誌（中斷後續傳用）：需明確指定路徑才啟用
+        journal_setting = data["paths"].get("upload_journal")
+        upload_journal = Path(journal_setting) if journal_setting else None
+        
         # Open Notebook 配置
         on_password = data["open_notebook"].get("password", "")
         env_password = self.env.get_open_notebook_password()
@@ -147,6 +197,10 @@ class ConfigLoader:
         open_notebook = OpenNotebookConfig(
             base_url=data["open_notebook"]["base_url"],
             password=on_password,
+            supports_topics_on_create=bool(
+                data["open_notebook"].get("supports_topics_on_create", False)
+            ),
+            embeds_on_create=bool(data["open_notebook"].get("embeds_on_create", False)),
         )
         
         # LLM 配置
@@ -170,6 +224,9 @@ class ConfigLoader:
             max_concurrent=batch.get("max_concurrent", 3),
             retry_attempts=batch.get("retry_attempts", 3),
             retry_delay=batch.get("retry_delay", 5),
+            max_inflight=batch.get("max_inflight", 8),
+            requests_per_second=batch.get("requests_per_second", 5.0),
+            upload_journal=upload_journal,
         )
     
     def load_topics_config(self, topics_path: Path | None = None) -> dict[str, TopicConfig]:
@@ -192,11 +249,7 @@ class ConfigLoader:
         if not topics_path.exists():
             raise ConfigNotFoundError(f"主題配置文件不存在: {topics_path}")
         
-        try:
-            with open(topics_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
-        except yaml.YAMLError as e:
-            raise ConfigValidationError(f"YAML 解析錯誤: {e}") from e
+        data = _read_yaml(topics_path)
         
         topics = {}
         for topic_id, topic_data in data.get("topics", {}).items():
@@ -205,7 +258,7 @@ class ConfigLoader:
                 description=topic_data["description"],
                 notebook=topic_data["notebook"],
                 prompt_template=topic_data["prompt_template"],
-                channels=topic_data.get("channels", []),
+                channels=list(topic_data.get("channels", [])),
             )
         
         return topics
@@ -228,11 +281,7 @@ class ConfigLoader:
         if not topics_path.exists():
             raise ConfigNotFoundError(f"主題配置文件不存在: {topics_path}")
         
-        try:
-            with open(topics_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
-        except yaml.YAMLError as e:
-            raise ConfigValidationError(f"YAML 解析錯誤: {e}") from e
+        data = _read_yaml(topics_path)
         
         channels = {}
         for channel_name, channel_data in data.get("channels", {}).items():
@@ -295,6 +344,12 @@ class ConfigValidator:
         if config.retry_delay < 0:
             errors.append(f"retry_delay 不能為負數: {config.retry_delay}")
         
+        if config.max_inflight < 1:
+            errors.append(f"max_inflight 至少為 1: {config.max_inflight}")
+        
+        if config.requests_per_second < 0:
+            errors.append(f"requests_per_second 不能為負數: {config.requests_per_second}")
+        
         return errors
     
     def validate_topics_config(self, topics: dict[str, TopicConfig]) -> list[str]:
@@ -6,7 +6,11 @@ Knowledge Pipeline - Discovery 模組
 
 from __future__ import annotations
 
+import fnmatch
+import mmap
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from pathlib import Path
@@ -14,9 +18,18 @@ from typing import Iterator
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:  # 未安裝 libyaml 時退回純 Python 版本
+    from yaml import SafeLoader as YamlSafeLoader
+
 from src.models import PipelineStatus, TranscriptFile, TranscriptMetadata
 
 
+# status 字串對應的列舉值（避免每次呼叫 PipelineStatus(...) 與其 ValueError 路徑）
+_STATUS_BY_VALUE: dict[str, PipelineStatus] = {status.value: status for status in PipelineStatus}
+
+
 # ============================================================================
 # 例外定義
 # ============================================================================
@@ -109,9 +122,10 @@ class FileScanner:
             raise DirectoryNotFoundError(f"路徑不是目錄: {root_dir}")
         
         # 遞迴搜尋所有符合 pattern 的檔案
-        for file_path in root_path.rglob(pattern):
-            if file_path.is_file():
-                yield file_path
+        # os.walk 以 scandir 區分檔案與目錄，不需對每個項目額外 stat
+        for dirpath, _, filenames in os.walk(root_path):
+            for filename in fnmatch.filter(filenames, pattern):
+                yield Path(dirpath, filename)
 
 
 # ============================================================================
@@ -160,7 +174,7 @@ class FrontmatterParser:
         
         # 解析 YAML
         try:
-            frontmatter = yaml.safe_load(frontmatter_text) or {}
+            frontmatter = yaml.load(frontmatter_text, Loader=YamlSafeLoader) or {}
         except yaml.YAMLError as e:
             raise FrontmatterParseError(f"YAML 解析失敗: {e}") from e
         
@@ -180,13 +194,110 @@ class FrontmatterParser:
             FileNotFoundError: 檔案不存在
             FrontmatterParseError: 解析失敗
         """
-        filepath = Path(filepath)
+        content = Path(filepath).read_text(encoding="utf-8")
+        return self.parse(content)
+    
+    def find_frontmatter_span(self, data: bytes | mmap.mmap) -> tuple[int, int] | None:
+        """
+        在原始 bytes 中定位 frontmatter 區塊
         
-        if not filepath.exists():
-            raise FileNotFoundError(f"檔案不存在: {filepath}")
+        判斷規則與 parse() 相同：略過開頭空白後需以 --- 開頭，並以下一個行首的 --- 結束。
         
-        content = filepath.read_text(encoding="utf-8")
-        return self.parse(content)
+        Args:
+            data: 檔案內容（bytes 或 mmap）
+            
+        Returns:
+            (開始, 結束) 位置，為開頭 --- 之後到結尾 --- 前換行字元的範圍；
+            若無 frontmatter 則為 None
+        """
+        # 跳過開頭空白（對應 parse() 的 strip）
+        start = 0
+        while start < len(data) and data[start:start + 1].isspace():
+            start += 1
+        
+        if data[start:start + 3] != b"---":
+            return None
+        
+        end = data.find(b"\n---", start + 3)
+        if end == -1:
+            return None
+        
+        return start + 3, end
+    
+    def read_frontmatter_bytes(self, filepath: Path) -> bytes:
+        """
+        讀取 Markdown 檔案 frontmatter 區塊的原始 bytes（不讀取正文）
+        
+        以 mmap 映射檔案並在 bytes 層級尋找結束的 ---，
+        只複製 frontmatter 區塊，正文不會被載入記憶體。
+        
+        Args:
+            filepath: Markdown 檔案路徑
+            
+        Returns:
+            開頭與結尾 --- 之間的 bytes，若無 frontmatter 則為 b""
+            
+        Raises:
+            FileNotFoundError: 檔案不存在
+        """
+        with open(filepath, "rb") as f:
+            if f.seek(0, 2) == 0:
+                return b""
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                span = self.find_frontmatter_span(mm)
+                if span is None:
+                    return b""
+                
+                return mm[span[0]:span[1]]
+    
+    def parse_file_body(self, filepath: Path) -> str:
+        """
+        只取得 Markdown 檔案的正文（不解析 frontmatter YAML）
+        
+        以 bytes 層級定位 frontmatter 結尾後直接切出正文，結果與 parse_file() 的正文相同。
+        
+        Args:
+            filepath: Markdown 檔案路徑
+            
+        Returns:
+            正文內容（不含 frontmatter）
+            
+        Raises:
+            FileNotFoundError: 檔案不存在
+        """
+        data = Path(filepath).read_bytes()
+        
+        span = self.find_frontmatter_span(data)
+        if span is not None:
+            # 跳過結尾的換行與 ---
+            data = data[span[1] + 4:]
+        
+        return data.decode("utf-8").strip()
+    
+    def parse_file_frontmatter(self, filepath: Path) -> dict:
+        """
+        只解析 Markdown 檔案的 frontmatter（不讀取正文）
+        
+        Args:
+            filepath: Markdown 檔案路徑
+            
+        Returns:
+            frontmatter 字典，若無 frontmatter 則為空 dict
+            
+        Raises:
+            FileNotFoundError: 檔案不存在
+            FrontmatterParseError: 解析失敗
+        """
+        frontmatter_bytes = self.read_frontmatter_bytes(filepath)
+        if not frontmatter_bytes:
+            return {}
+        
+        try:
+            frontmatter_text = frontmatter_bytes.decode("utf-8").strip()
+            return yaml.load(frontmatter_text, Loader=YamlSafeLoader) or {}
+        except (UnicodeDecodeError, yaml.YAMLError) as e:
+            raise FrontmatterParseError(f"YAML 解析失敗: {e}") from e
 
 
 # ============================================================================
@@ -369,13 +480,10 @@ class StatusChecker:
         """
         status_str = frontmatter.get("status")
         
-        if not status_str:
+        if not isinstance(status_str, str):
             return None
         
-        try:
-            return PipelineStatus(status_str)
-        except ValueError:
-            return None
+        return _STATUS_BY_VALUE.get(status_str)
     
     def is_processed(self, frontmatter: dict) -> bool:
         """
@@ -505,14 +613,14 @@ class FileFilter:
         Returns:
             True 表示 pending 檔案已存在，應跳過
         """
-        year_month = metadata.published_at.strftime("%Y-%m")
+        year_month = metadata.published_ym
         slug = self._slugify(metadata.title, max_length=50)
         pending_file = (
             self.intermediate_dir
             / "pending"
             / metadata.channel
             / year_month
-            / f"{metadata.published_at.strftime('%Y%m%d')}_{metadata.video_id}_{slug}_analyzed.md"
+            / f"{metadata.published_ymd}_{metadata.video_id}_{slug}_analyzed.md"
         )
         return pending_file.exists()
     
@@ -580,7 +688,8 @@ class DiscoveryService:
         status_checker: StatusChecker | None = None,
         file_filter: FileFilter | None = None,
         temp_dir: Path | None = None,
-        intermediate_dir: Path | None = None
+        intermediate_dir: Path | None = None,
+        max_workers: int | None = None
     ):
         """
         初始化發現服務
@@ -593,6 +702,7 @@ class DiscoveryService:
             file_filter: 檔案過濾器（若提供則忽略 intermediate_dir）
             temp_dir: 臨時檔案目錄
             intermediate_dir: intermediate 目錄路徑，用於 pending 檔案存在性檢查
+            max_workers: 並行讀取 frontmatter 的執行緒數，None 表示依 CPU 數決定
         """
         self.scanner = scanner or FileScanner()
         self.parser = parser or FrontmatterParser()
@@ -603,6 +713,8 @@ class DiscoveryService:
             intermediate_dir=intermediate_dir
         )
         self.temp_dir = temp_dir or Path("temp")
+        # frontmatter 讀取以 I/O 為主，執行緒數可高於 CPU 數
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
         
         self._stats = DiscoveryStatistics()
     
@@ -616,12 +728,45 @@ class DiscoveryService:
         """
         發現待處理的轉錄檔案
         
+        為 iter_discover() 的列表版本。
+        
+        Args:
+            root_dir: 掃描根目錄
+            min_word_count: 最小字數限制（預設 100）
+            channel_whitelist: 頻道白名單，None 表示不限制
+            channel_blacklist: 頻道黑名單，None 表示不限制
+            
+        Returns:
+            待處理的 TranscriptFile 列表
+        """
+        return list(self.iter_discover(
+            root_dir,
+            min_word_count=min_word_count,
+            channel_whitelist=channel_whitelist,
+            channel_blacklist=channel_blacklist
+        ))
+    
+    def iter_discover(
+        self,
+        root_dir: Path,
+        min_word_count: int = 100,
+        channel_whitelist: list[str] | None = None,
+        channel_blacklist: list[str] | None = None
+    ) -> Iterator[TranscriptFile]:
+        """
+        逐一產生待處理的轉錄檔案
+        
+        掃描後以執行緒池並行讀取 frontmatter，並依掃描順序逐一產生結果，
+        呼叫端可在全部檔案讀取完成前開始處理；
+        統計資訊隨迭代累計，迭代結束後與 discover() 相同。
+        
         完整流程：
         1. 掃描目錄中的所有 .md 檔案
-        2. 解析 frontmatter 與 content
+        2. 並行解析 frontmatter
         3. 檢查 status 欄位，跳過已處理檔案
         4. 檢查字數，過濾過短內容
         5. 檢查頻道白名單/黑名單
+        6. 讀取通過過濾檔案的 content
         
         Args:
             root_dir: 掃描根目錄
@@ -629,8 +774,8 @@ class DiscoveryService:
             channel_whitelist: 頻道白名單，None 表示不限制
             channel_blacklist: 頻道黑名單，None 表示不限制
             
-        Returns:
-            待處理的 TranscriptFile 列表
+        Yields:
+            待處理的 TranscriptFile
         """
         # 重置統計
         self._stats = DiscoveryStatistics()
@@ -638,68 +783,79 @@ class DiscoveryService:
         # 更新過濾器的最小字數
         self.file_filter.min_word_count = min_word_count
         
-        results: list[TranscriptFile] = []
+        # 掃描所有檔案，並行讀取 frontmatter（無 frontmatter 或會被過濾的檔案不需讀取正文）
+        file_paths = list(self.scanner.scan(root_dir))
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(file_paths))))
         
-        # 掃描所有檔案
-        for file_path in self.scanner.scan(root_dir):
-            self._stats.total_scanned += 1
+        try:
+            futures = [
+                executor.submit(self.parser.parse_file_frontmatter, file_path)
+                for file_path in file_paths
+            ]
             
-            try:
-                # 解析 frontmatter
-                frontmatter, content = self.parser.parse_file(file_path)
-                self._stats.parsed_success += 1
-                
-                # 提取 metadata
-                metadata = self.extractor.extract(frontmatter, file_path)
-                
-                # 檢查是否應該處理
-                should_process, reason = self.file_filter.should_process(
-                    metadata, frontmatter, file_path
-                )
+            for file_path, future in zip(file_paths, futures):
+                self._stats.total_scanned += 1
                 
-                if not should_process:
-                    if "已處理" in reason:
-                        self._stats.filtered_by_status += 1
-                    elif "已分析" in reason:
-                        self._stats.filtered_by_pending += 1
-                    elif "字數" in reason:
-                        self._stats.filtered_by_word_count += 1
+                try:
+                    frontmatter = future.result()
+                    self._stats.parsed_success += 1
+                    
+                    # 提取 metadata
+                    metadata = self.extractor.extract(frontmatter, file_path)
+                    
+                    # 檢查是否應該處理
+                    should_process, reason = self.file_filter.should_process(
+                        metadata, frontmatter, file_path
+                    )
+                    
+                    if not should_process:
+                        if "已處理" in reason:
+                            self._stats.filtered_by_status += 1
+                        elif "已分析" in reason:
+                            self._stats.filtered_by_pending += 1
+                        elif "字數" in reason:
+                            self._stats.filtered_by_word_count += 1
+                        continue
+                    
+                    # 檢查頻道限制
+                    should_process, reason = self.file_filter.filter_by_channel(
+                        metadata, channel_whitelist, channel_blacklist
+                    )
+                    
+                    if not should_process:
+                        self._stats.filtered_by_channel += 1
+                        continue
+                    
+                    # 通過過濾後才讀取正文（frontmatter 已解析，只切出正文不再跑 YAML）
+                    content = self.parser.parse_file_body(file_path)
+                    
+                    # 取得 status
+                    status = self.status_checker.get_status(frontmatter)
+                    source_id = frontmatter.get("source_id")
+                    
+                    # 建立 TranscriptFile
+                    transcript = TranscriptFile(
+                        path=file_path,
+                        metadata=metadata,
+                        content=content,
+                        status=status,
+                        source_id=source_id
+                    )
+                    
+                    self._stats.ready_to_process += 1
+                    
+                except (FrontmatterParseError, MetadataExtractionError) as e:
+                    self._stats.parsed_failed += 1
+                    # 記錄錯誤但繼續處理
                     continue
-                
-                # 檢查頻道限制
-                should_process, reason = self.file_filter.filter_by_channel(
-                    metadata, channel_whitelist, channel_blacklist
-                )
-                
-                if not should_process:
-                    self._stats.filtered_by_channel += 1
+                except Exception as e:
+                    self._stats.parsed_failed += 1
                     continue
                 
-                # 取得 status
-                status = self.status_checker.get_status(frontmatter)
-                source_id = frontmatter.get("source_id")
-                
-                # 建立 TranscriptFile
-                transcript = TranscriptFile(
-                    path=file_path,
-                    metadata=metadata,
-                    content=content,
-                    status=status,
-                    source_id=source_id
-                )
-                
-                results.append(transcript)
-                self._stats.ready_to_process += 1
-                
-            except (FrontmatterParseError, MetadataExtractionError) as e:
-                self._stats.parsed_failed += 1
-                # 記錄錯誤但繼續處理
-                continue
-            except Exception as e:
-                self._stats.parsed_failed += 1
-                continue
-        
-        return results
+                yield transcript
+        finally:
+            # 呼叫端提前停止迭代時，取消尚未開始的讀取
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def get_statistics(self) -> DiscoveryStatistics:
         """
@@ -8,24 +8,91 @@ Knowledge Pipeline - CLI 入口
 from __future__ import annotations
 
 import argparse
+import functools
+import json
 import logging
+import logging.handlers
+import os
 import sys
+import threading
 from pathlib import Path
-from typing import Sequence
+from typing import Iterator, Sequence
 
 from src.analyzer import AnalyzerService
-from src.config import ConfigLoader, ConfigValidator, TopicResolver, load_config
+from src.config import ConfigLoader, ConfigValidator, TopicNotFoundError, TopicResolver
 from src.discovery import DiscoveryService
 from src.llm import LLMClient
-from src.models import PipelineConfig
-from src.state import StateManager
-from src.uploader import OpenNotebookClient, UploaderService
+from src.models import AnalyzedTranscript, PipelineConfig, TranscriptFile
+from src.state import StateManager, StatePersistence
+from src.uploader import (
+    ExponentialBackoffRetry,
+    OpenNotebookClient,
+    UploaderService,
+    UploadJournal,
+    UploadResult,
+)
 
 
 # ============================================================================
 # 設定日誌
 # ============================================================================
 
+# 各階段標題的分隔線
+_BANNER = "=" * 60
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    JSON 日誌格式
+    
+    以 json.dumps 序列化每筆記錄，確保訊息中的引號與換行正確跳脫。
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class _PeriodicFlushHandler(logging.handlers.MemoryHandler):
+    """
+    定時寫出的緩衝處理器
+    
+    除了緩衝滿或遇到 flushLevel 以上的紀錄時寫出，背景執行緒每 flush_interval 秒
+    也會寫出一次，長時間分析時 tail 日誌仍能即時看到進度，強制終止時最多遺失這段時間的紀錄。
+    """
+    
+    def __init__(
+        self,
+        capacity: int,
+        flushLevel: int,
+        target: logging.Handler,
+        flush_interval: float = 1.0
+    ):
+        super().__init__(capacity, flushLevel=flushLevel, target=target)
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            args=(flush_interval,),
+            name="log-flush",
+            daemon=True
+        )
+        self._flusher.start()
+    
+    def _flush_periodically(self, interval: float) -> None:
+        while not self._stopped.wait(interval):
+            self.flush()
+    
+    def close(self) -> None:
+        self._stopped.set()
+        super().close()
+
+
 def setup_logging(level: str = "INFO", format_type: str = "console") -> logging.Logger:
     """
     設定日誌
@@ -40,7 +107,9 @@ def setup_logging(level: str = "INFO", format_type: str = "console") -> logging.
     logger = logging.getLogger("knowledge_pipeline")
     logger.setLevel(getattr(logging, level.upper()))
     
-    # 清除現有處理器
+    # 清除現有處理器（先關閉，寫出緩衝並停止定時寫出的執行緒）
+    for existing in logger.handlers:
+        existing.close()
     logger.handlers.clear()
     
     # 建立處理器
@@ -49,9 +118,7 @@ def setup_logging(level: str = "INFO", format_type: str = "console") -> logging.
     
     # 設定格式
     if format_type == "json":
-        formatter = logging.Formatter(
-            '{"timestamp": "%(asctime)s", "level": "%(levelname)s", "message": "%(message)s"}'
-        )
+        formatter = JsonFormatter()
     else:
         formatter = logging.Formatter(
             "%(asctime)s - %(levelname)s - %(message)s",
@@ -59,11 +126,48 @@ def setup_logging(level: str = "INFO", format_type: str = "console") -> logging.
         )
     
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    
+    if format_type == "json":
+        # JSON 日誌供批次執行收集，先緩衝再整批寫出，減少逐行 write；
+        # WARNING 以上立即輸出，其餘最多延遲 1 秒，程式結束時 logging.shutdown 會寫出剩餘紀錄
+        logger.addHandler(_PeriodicFlushHandler(
+            capacity=64,
+            flushLevel=logging.WARNING,
+            target=handler
+        ))
+    else:
+        logger.addHandler(handler)
     
     return logger
 
 
+# ============================================================================
+# 檔案掃描
+# ============================================================================
+
+def _iter_analyzed(root: Path) -> Iterator[Path]:
+    """
+    遞迴列出 root 下所有 *_analyzed.md 檔案
+    
+    使用 os.scandir 手動堆疊走訪，檔名與類型判斷皆由 DirEntry 快取提供，
+    避免 Path.rglob 對每個項目額外 stat。
+    
+    Args:
+        root: 掃描根目錄
+        
+    Yields:
+        分析後檔案路徑
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith("_analyzed.md") and entry.is_file(follow_symlinks=False):
+                    yield Path(entry.path)
+
+
 # ============================================================================
 # Pipeline 類別
 # ============================================================================
@@ -80,7 +184,9 @@ class KnowledgePipeline:
         config: PipelineConfig,
         logger: logging.Logger,
         topics_config: dict | None = None,
-        channels_config: dict | None = None
+        channels_config: dict | None = None,
+        concurrent_uploads: int | None = None,
+        use_journal: bool = True
     ):
         """
         初始化 Pipeline
@@ -90,19 +196,28 @@ class KnowledgePipeline:
             logger: 日誌實例
             topics_config: 主題配置（可選，用於自動選擇模板）
             channels_config: 頻道配置（可選，用於自動選擇模板）
+            concurrent_uploads: 同時上傳數（可選，預設沿用 config.max_concurrent）
+            use_journal: 是否使用配置的上傳日誌（False 時即使已配置也不開啟）
         """
         self.config = config
         self.logger = logger
+        self.concurrent_uploads = concurrent_uploads or config.max_concurrent
+        # 上傳日誌路徑；實際上傳時才開啟，discover / analyze / dry run 不建立檔案
+        self.journal_path = config.upload_journal if use_journal else None
         
         # 載入主題配置（如果未提供）
         if topics_config is None or channels_config is None:
-            _, self.topics_config, self.channels_config = load_config()
+            config_loader = ConfigLoader()
+            self.topics_config = config_loader.load_topics_config()
+            self.channels_config = config_loader.load_channels_config()
         else:
             self.topics_config = topics_config
             self.channels_config = channels_config
         
         # 初始化主題解析器
         self.topic_resolver = TopicResolver()
+        self._build_notebook_lookup()
+        self._channel_templates: dict[str, str] = {}
         
         # 初始化各個服務
         self.discovery = DiscoveryService(
@@ -127,12 +242,24 @@ class KnowledgePipeline:
         )
         
         # Uploader（啟用自動 Insights 生成）
-        self.on_client = OpenNotebookClient(config.open_notebook)
+        # 並行上傳時 429/503 較常見，使用指數退避 + 抖動錯開重試
+        self.on_client = OpenNotebookClient(
+            config.open_notebook,
+            retry_strategy=ExponentialBackoffRetry(),
+            pool_maxsize=max(10, self.concurrent_uploads),
+            max_inflight=config.max_inflight,
+            requests_per_second=config.requests_per_second,
+            supports_topics_on_create=config.open_notebook.supports_topics_on_create,
+            embeds_on_create=config.open_notebook.embeds_on_create
+        )
         self.uploader = UploaderService(
             self.on_client,
             auto_insights=True,  # 上傳後自動生成 Insights
             transformation_ids=None  # None = 自動偵測（優先使用 Key Insights）
         )
+        
+        # 最近一次 Discovery 的結果（供 run_full_pipeline 傳給分析階段重用）
+        self._last_transcripts: list[TranscriptFile] = []
     
     def run_discovery(
         self,
@@ -149,16 +276,16 @@ class KnowledgePipeline:
             channel: 指定單一頻道（優先於白名單）
             
         Returns:
-            發現的檔案數量
+            發現的檔案數量（完整列表保存於 self._last_transcripts）
         """
-        self.logger.info("=" * 60)
+        self.logger.info(_BANNER)
         self.logger.info("Discovery Phase - 掃描轉錄檔案")
-        self.logger.info("=" * 60)
+        self.logger.info(_BANNER)
         
         # 清理過期 temp 檔案
         cleaned = self.discovery.cleanup_temp_files()
         if cleaned > 0:
-            self.logger.info(f"清理 {cleaned} 個過期臨時檔案")
+            self.logger.info("清理 %s 個過期臨時檔案", cleaned)
         
         # 執行發現
         transcriber_output = Path(self.config.transcriber_output)
@@ -171,17 +298,18 @@ class KnowledgePipeline:
             min_word_count=min_word_count,
             channel_whitelist=effective_whitelist
         )
+        self._last_transcripts = transcripts
         
         # 輸出統計
         stats = self.discovery.get_statistics()
-        self.logger.info(f"掃描檔案: {stats.total_scanned}")
-        self.logger.info(f"解析成功: {stats.parsed_success}")
-        self.logger.info(f"解析失敗: {stats.parsed_failed}")
-        self.logger.info(f"已處理跳過: {stats.filtered_by_status}")
-        self.logger.info(f"已分析跳過: {stats.filtered_by_pending}")
-        self.logger.info(f"字數不足跳過: {stats.filtered_by_word_count}")
-        self.logger.info(f"頻道限制跳過: {stats.filtered_by_channel}")
-        self.logger.info(f"待處理: {stats.ready_to_process}")
+        self.logger.info("掃描檔案: %s", stats.total_scanned)
+        self.logger.info("解析成功: %s", stats.parsed_success)
+        self.logger.info("解析失敗: %s", stats.parsed_failed)
+        self.logger.info("已處理跳過: %s", stats.filtered_by_status)
+        self.logger.info("已分析跳過: %s", stats.filtered_by_pending)
+        self.logger.info("字數不足跳過: %s", stats.filtered_by_word_count)
+        self.logger.info("頻道限制跳過: %s", stats.filtered_by_channel)
+        self.logger.info("待處理: %s", stats.ready_to_process)
         
         return len(transcripts)
     
@@ -207,32 +335,37 @@ class KnowledgePipeline:
         """
         # 優先使用手動指定的模板
         if manual_template and manual_template != "default":
-            self.logger.debug(f"使用手動指定的模板: {manual_template}")
+            self.logger.debug("使用手動指定的模板: %s", manual_template)
             return manual_template
         
-        # 嘗試根據頻道解析主題
-        try:
-            topic_id = self.topic_resolver.resolve_topic(
-                channel=channel,
-                suggested_topic=None,
-                topics_config=self.topics_config,
-                channels_config=self.channels_config
-            )
-            template = self.topic_resolver.get_prompt_template_for_topic(
-                topic_id,
-                self.topics_config
-            )
-            self.logger.info(f"頻道 '{channel}' 使用自動模板: {template}")
-            return template
-        except Exception as e:
-            self.logger.warning(f"無法解析頻道 '{channel}' 的模板: {e}，使用預設值")
-            return "default"
+        # 嘗試根據頻道解析主題（結果依頻道快取）
+        template = self._channel_templates.get(channel)
+        if template is None:
+            try:
+                topic_id = self.topic_resolver.resolve_topic(
+                    channel=channel,
+                    suggested_topic=None,
+                    topics_config=self.topics_config,
+                    channels_config=self.channels_config
+                )
+                template = self.topic_resolver.get_prompt_template_for_topic(
+                    topic_id,
+                    self.topics_config
+                )
+            except Exception as e:
+                self.logger.warning("無法解析頻道 '%s' 的模板: %s，使用預設值", channel, e)
+                return "default"
+            self._channel_templates[channel] = template
+        
+        self.logger.info("頻道 '%s' 使用自動模板: %s", channel, template)
+        return template
     
     def run_analysis(
         self,
         prompt_template: str = "default",
         batch_size: int = 10,
-        channel: str | None = None
+        channel: str | None = None,
+        transcripts: list[TranscriptFile] | None = None
     ) -> int:
         """
         執行分析階段
@@ -241,23 +374,25 @@ class KnowledgePipeline:
             prompt_template: Prompt 模板名稱（手動指定，會覆蓋自動選擇）
             batch_size: 批次大小
             channel: 指定單一頻道
+            transcripts: 已發現的待處理檔案（None 表示重新執行發現）
             
         Returns:
             分析的檔案數量
         """
         self.logger.info("")
-        self.logger.info("=" * 60)
+        self.logger.info(_BANNER)
         self.logger.info("Analysis Phase - 語意分析")
-        self.logger.info("=" * 60)
-        
-        # 再次執行發現（取得待處理檔案）
-        transcriber_output = Path(self.config.transcriber_output)
-        effective_whitelist = [channel] if channel else None
-        transcripts = self.discovery.discover(
-            root_dir=transcriber_output,
-            min_word_count=100,
-            channel_whitelist=effective_whitelist
-        )
+        self.logger.info(_BANNER)
+        
+        # 未提供發現結果時才重新掃描（取得待處理檔案）
+        if transcripts is None:
+            transcriber_output = Path(self.config.transcriber_output)
+            effective_whitelist = [channel] if channel else None
+            transcripts = self.discovery.discover(
+                root_dir=transcriber_output,
+                min_word_count=100,
+                channel_whitelist=effective_whitelist
+            )
         
         if not transcripts:
             self.logger.info("沒有待處理的檔案")
@@ -270,10 +405,8 @@ class KnowledgePipeline:
             first_channel = transcripts[0].metadata.channel
             
             # 檢查是否所有檔案都是同一個頻道
-            all_same_channel = all(
-                t.metadata.channel == first_channel 
-                for t in transcripts
-            )
+            channels = {t.metadata.channel for t in transcripts}
+            all_same_channel = len(channels) == 1
             
             if all_same_channel:
                 effective_template = self._get_prompt_template_for_channel(
@@ -284,16 +417,16 @@ class KnowledgePipeline:
                 self.logger.info("多頻道混合，使用預設模板: default")
                 effective_template = "default"
             else:
-                self.logger.info(f"多頻道混合，使用手動指定模板: {prompt_template}")
+                self.logger.info("多頻道混合，使用手動指定模板: %s", prompt_template)
                 effective_template = prompt_template
         
-        self.logger.info(f"開始分析 {len(transcripts)} 個檔案，模板: {effective_template}")
+        self.logger.info("開始分析 %s 個檔案，模板: %s", len(transcripts), effective_template)
         
         # 批次分析
         analyzed_count = 0
         
         def on_progress(current: int, total: int, status: str):
-            self.logger.info(f"[{current}/{total}] {status}")
+            self.logger.info("[%s/%s] %s", current, total, status)
         
         try:
             results = self.analyzer.analyze_batch(
@@ -301,13 +434,14 @@ class KnowledgePipeline:
                 prompt_template=effective_template,
                 output_dir=Path(self.config.intermediate) / "pending",
                 progress_callback=on_progress,
-                delay_between_calls=1.0
+                delay_between_calls=1.0,
+                max_concurrent=self.config.max_concurrent
             )
             analyzed_count = len(results)
         except Exception as e:
-            self.logger.error(f"分析過程發生錯誤: {e}")
+            self.logger.error("分析過程發生錯誤: %s", e)
         
-        self.logger.info(f"分析完成: {analyzed_count}/{len(transcripts)}")
+        self.logger.info("分析完成: %s/%s", analyzed_count, len(transcripts))
         return analyzed_count
     
     def run_upload(self, dry_run: bool = False) -> int:
@@ -321,9 +455,9 @@ class KnowledgePipeline:
             上傳的檔案數量
         """
         self.logger.info("")
-        self.logger.info("=" * 60)
+        self.logger.info(_BANNER)
         self.logger.info("Upload Phase - 上傳至 Open Notebook")
-        self.logger.info("=" * 60)
+        self.logger.info(_BANNER)
         
         if dry_run:
             self.logger.info("[DRY RUN] 模擬模式，不會實際上傳")
@@ -342,66 +476,145 @@ class KnowledgePipeline:
             return 0
         
         # 尋找所有待上傳的檔案
-        from src.state import StatePersistence
-        
         persistence = StatePersistence()
-        pending_files = list(pending_dir.rglob("*_analyzed.md"))
+        pending_files = list(_iter_analyzed(pending_dir))
         
         if not pending_files:
             self.logger.info("沒有待上傳的檔案")
             return 0
         
-        self.logger.info(f"找到 {len(pending_files)} 個待上傳檔案")
-        
-        uploaded_count = 0
+        self.logger.info("找到 %s 個待上傳檔案", len(pending_files))
         
+        # 先載入所有分析結果並決定目標 Notebook（只讀 frontmatter，皆為本地操作）
+        failures: list[tuple[Path, str]] = []
+        items: list[tuple[Path, AnalyzedTranscript, str]] = []
         for file_path in pending_files:
             try:
-                # 載入分析結果
                 analyzed = persistence.load_analyzed_transcript(file_path)
-                
-                # 決定 Notebook 名稱
-                notebook_name = self._resolve_notebook(analyzed)
-                
-                if dry_run:
-                    self.logger.info(f"[DRY RUN] 將上傳到 {notebook_name}: {analyzed.original.title}")
-                    uploaded_count += 1
-                    continue
-                
-                # 執行上傳（傳遞檔案路徑以讀取分析後的內容）
-                source_id = self.uploader.upload(analyzed, notebook_name, file_path)
-                
-                # 更新檔案狀態
-                intermediate_dir = Path(self.config.intermediate)
-                original_path = Path(analyzed.processing.source_path)
-                self.state_manager.mark_as_uploaded(
-                    filepath=file_path,
-                    source_id=source_id,
-                    intermediate_dir=intermediate_dir,
-                    original_filepath=original_path
-                )
-                
-                self.logger.info(f"上傳成功: {source_id} -> {notebook_name}")
-                uploaded_count += 1
-                
+                items.append((file_path, analyzed, self._resolve_notebook(analyzed)))
             except Exception as e:
-                self.logger.error(f"上傳失敗 {file_path}: {e}")
-                # 標記為失敗
-                try:
-                    self.state_manager.mark_as_failed(
-                        filepath=file_path,
-                        error=str(e),
-                        error_code="UPLOAD_ERROR"
-                    )
-                except Exception:
-                    pass
+                self.logger.error("上傳失敗 %s: %s", file_path, e)
+                failures.append((file_path, str(e)))
+        
+        if dry_run:
+            for _, analyzed, notebook_name in items:
+                self.logger.info("[DRY RUN] 將上傳到 %s: %s", notebook_name, analyzed.original.title)
+        elif items:
+            # 交由 upload_batch 並行上傳：Notebook 一次解析完，並行數依耗時與 429 自動調整；
+            # 每筆完成時立即寫回狀態（各檔案狀態寫入互不重疊）
+            errors: list[str | None] = [None] * len(items)
+            
+            def on_result(index: int, result: UploadResult) -> None:
+                errors[index] = self._finish_upload(*items[index], result)
+            
+            self._open_journal()
+            self.uploader.upload_batch(
+                [
+                    (analyzed, notebook_name, file_path)
+                    for file_path, analyzed, notebook_name in items
+                ],
+                max_workers=self.concurrent_uploads,
+                on_result=on_result
+            )
+            failures.extend(
+                (file_path, error)
+                for (file_path, _, _), error in zip(items, errors)
+                if error is not None
+            )
+        
+        # 失敗檔案於批次結束後統一標記
+        self._record_failures(failures)
+        uploaded_count = len(pending_files) - len(failures)
         
         # 輸出統計
         stats = self.uploader.get_statistics()
-        self.logger.info(f"上傳完成: {stats.successful}/{stats.total_uploaded}")
+        self.logger.info("上傳完成: %s/%s", stats.successful, stats.total_uploaded)
         
         return uploaded_count
     
+    def _open_journal(self) -> None:
+        """
+        開啟上傳日誌（已配置且尚未開啟時）
+        
+        中斷後重新執行時，已完成的上傳直接沿用日誌中的 Source ID。
+        日誌無法開啟時只記錄警告，本次上傳不使用日誌。
+        """
+        if self.journal_path is None or self.uploader.journal is not None:
+            return
+        try:
+            self.uploader.journal = UploadJournal(self.journal_path)
+        except Exception as e:
+            self.logger.warning("無法開啟上傳日誌 %s，本次不使用: %s", self.journal_path, e)
+            self.journal_path = None
+            return
+        self.logger.info("上傳日誌: %s", self.journal_path)
+    
+    def _finish_upload(
+        self,
+        file_path: Path,
+        analyzed: AnalyzedTranscript,
+        notebook_name: str,
+        result: UploadResult
+    ) -> str | None:
+        """
+        依單筆上傳結果更新檔案狀態
+        
+        由 upload_batch 於工作執行緒呼叫；失敗時僅記錄錯誤並回傳錯誤訊息，不拋出例外，
+        failed 狀態由呼叫端於批次結束後透過 _record_failures 統一寫入。
+        
+        Args:
+            file_path: 分析後檔案路徑
+            analyzed: 已載入的分析結果
+            notebook_name: 目標 Notebook 名稱
+            result: 上傳結果
+            
+        Returns:
+            None 表示上傳成功，否則為錯誤訊息
+        """
+        if not result.success:
+            self.logger.error("上傳失敗 %s: %s", file_path, result.error)
+            return result.error
+        
+        try:
+            # 更新檔案狀態
+            intermediate_dir = Path(self.config.intermediate)
+            original_path = Path(analyzed.processing.source_path)
+            original = analyzed.original
+            self.state_manager.mark_as_uploaded(
+                filepath=file_path,
+                source_id=result.source_id,
+                intermediate_dir=intermediate_dir,
+                original_filepath=original_path,
+                channel=original.channel,
+                year_month=original.published_ym
+            )
+            
+            self.logger.info("上傳成功: %s -> %s", result.source_id, notebook_name)
+            return None
+            
+        except Exception as e:
+            self.logger.error("上傳失敗 %s: %s", file_path, e)
+            return str(e)
+    
+    def _record_failures(self, failures: Sequence[tuple[Path, str]]) -> None:
+        """
+        將上傳失敗的檔案標記為 failed
+        
+        在所有上傳完成後依序寫入，無法寫入狀態的檔案會記錄警告而非靜默忽略。
+        
+        Args:
+            failures: (檔案路徑, 錯誤訊息) 列表
+        """
+        for file_path, error in failures:
+            try:
+                self.state_manager.mark_as_failed(
+                    filepath=file_path,
+                    error=error,
+                    error_code="UPLOAD_ERROR"
+                )
+            except Exception as e:
+                self.logger.warning("無法標記失敗狀態 %s: %s", file_path, e)
+    
     def run_full_pipeline(
         self,
         prompt_template: str = "default",
@@ -432,8 +645,12 @@ class KnowledgePipeline:
             self.logger.info("沒有待處理的檔案，結束流程")
             return results
         
-        # Analysis
-        results["analyzed"] = self.run_analysis(prompt_template, channel=channel)
+        # Analysis（重用 Discovery 結果，避免重複掃描與解析）
+        results["analyzed"] = self.run_analysis(
+            prompt_template,
+            channel=channel,
+            transcripts=self._last_transcripts
+        )
         
         if results["analyzed"] == 0:
             self.logger.info("沒有分析成功的檔案，跳過上傳")
@@ -444,6 +661,31 @@ class KnowledgePipeline:
         
         return results
     
+    def _build_notebook_lookup(self) -> None:
+        """
+        預先計算 topic / 頻道對應的 Notebook Base Name
+        
+        主題配置在 Pipeline 生命週期內不變，預先展開 TopicResolver 的查詢結果，
+        讓 _resolve_notebook 只需字典查詢。
+        """
+        self._topic_to_notebook: dict[str, str] = {
+            topic_id: self.topic_resolver.get_notebook_for_topic(topic_id, self.topics_config)
+            for topic_id in self.topics_config
+        }
+        self._channel_to_notebook: dict[str, str] = {
+            channel: self._topic_to_notebook[
+                self.topic_resolver.resolve_topic(
+                    channel=channel,
+                    suggested_topic=None,  # 強制使用頻道預設
+                    topics_config=self.topics_config,
+                    channels_config=self.channels_config
+                )
+            ]
+            for channel in self.channels_config
+        } if self.topics_config else {}
+        # 未設定預設主題的頻道使用第一個可用的主題（與 TopicResolver 一致）
+        self._default_notebook: str | None = next(iter(self._topic_to_notebook.values()), None)
+    
     def _resolve_notebook(self, analyzed) -> str:
         """
         解析 Notebook 名稱（自動按月分片）
@@ -470,26 +712,16 @@ class KnowledgePipeline:
         base_notebook: str | None = None
         
         # 情況 1：LLM 回答有效的 topic ID
-        if suggested and suggested in self.topics_config and suggested != "unknown":
-            base_notebook = self.topic_resolver.get_notebook_for_topic(
-                suggested, self.topics_config
-            )
-        # 情況 2：LLM 回答 "unknown"
+        # 情況 2：LLM 回答 "unknown"（同樣以 topic ID 查表）
+        if suggested and suggested in self._topic_to_notebook:
+            base_notebook = self._topic_to_notebook[suggested]
         elif suggested == "unknown":
-            base_notebook = self.topic_resolver.get_notebook_for_topic(
-                "unknown", self.topics_config
-            )
+            raise TopicNotFoundError("主題不存在: unknown")
         # 情況 3：LLM 無回答或無效值 → 頻道 fallback
         else:
-            topic_id = self.topic_resolver.resolve_topic(
-                channel=channel,
-                suggested_topic=None,  # 強制使用頻道預設
-                topics_config=self.topics_config,
-                channels_config=self.channels_config
-            )
-            base_notebook = self.topic_resolver.get_notebook_for_topic(
-                topic_id, self.topics_config
-            )
+            base_notebook = self._channel_to_notebook.get(channel, self._default_notebook)
+            if base_notebook is None:
+                raise TopicNotFoundError("沒有可用的主題配置")
         
         # 加上年月後綴（按月分片）
         # 使用影片發布日期，確保同一個月的影片進入同一個 Notebook
@@ -501,10 +733,14 @@ class KnowledgePipeline:
 # CLI 命令處理
 # ============================================================================
 
+@functools.cache
 def create_parser() -> argparse.ArgumentParser:
     """
     建立 CLI 參數解析器
     
+    結果會在同一直譯器內快取共用；parse_args 只產生新的 Namespace，
+    不會修改 parser 本身，取得後請勿再新增參數或修改設定。
+    
     Returns:
         ArgumentParser 實例
     """
@@ -568,6 +804,17 @@ def create_parser() -> argparse.ArgumentParser:
         default=None,
         help="只處理指定頻道（例如: Ross_Coulthart）"
     )
+    run_parser.add_argument(
+        "--concurrent-uploads",
+        type=int,
+        default=None,
+        help="同時上傳數（預設沿用配置的 max_concurrent）"
+    )
+    run_parser.add_argument(
+        "--no-journal",
+        action="store_true",
+        help="不使用上傳日誌（忽略配置的 paths.upload_journal）"
+    )
     
     # discover 命令
     discover_parser = subparsers.add_parser(
@@ -610,6 +857,17 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="測試模式，不上傳"
     )
+    upload_parser.add_argument(
+        "--concurrent-uploads",
+        type=int,
+        default=None,
+        help="同時上傳數（預設沿用配置的 max_concurrent）"
+    )
+    upload_parser.add_argument(
+        "--no-journal",
+        action="store_true",
+        help="不使用上傳日誌（忽略配置的 paths.upload_journal）"
+    )
     
     return parser
 
@@ -639,10 +897,10 @@ def main(args: Sequence[str] | None = None) -> int:
         # 載入配置
         config_path = Path(parsed_args.config)
         if not config_path.exists():
-            logger.error(f"配置文件不存在: {config_path}")
+            logger.error("配置文件不存在: %s", config_path)
             return 1
         
-        logger.info(f"載入配置: {config_path}")
+        logger.info("載入配置: %s", config_path)
         
         config_loader = ConfigLoader()
         config = config_loader.load_pipeline_config(config_path)
@@ -652,49 +910,56 @@ def main(args: Sequence[str] | None = None) -> int:
         errors = validator.validate_pipeline_config(config)
         if errors:
             for error in errors:
-                logger.error(f"配置錯誤: {error}")
+                logger.error("配置錯誤: %s", error)
             return 1
         
-        # 載入主題配置
-        _, topics_config, channels_config = load_config()
+        # 初始化 Pipeline（主題配置由 Pipeline 自行載入）
+        concurrent_uploads = getattr(parsed_args, "concurrent_uploads", None)
+        if concurrent_uploads is not None and concurrent_uploads < 1:
+            logger.error("--concurrent-uploads 至少為 1: %s", concurrent_uploads)
+            return 1
         
-        # 初始化 Pipeline
         pipeline = KnowledgePipeline(
             config=config,
             logger=logger,
-            topics_config=topics_config,
-            channels_config=channels_config
+            concurrent_uploads=concurrent_uploads,
+            use_journal=not getattr(parsed_args, "no_journal", False)
         )
         
-        # 執行命令
-        if parsed_args.command == "run":
-            results = pipeline.run_full_pipeline(
-                prompt_template=parsed_args.template,
-                dry_run=parsed_args.dry_run,
-                channel=parsed_args.channel
-            )
-            logger.info("")
-            logger.info("=" * 60)
-            logger.info("Pipeline 完成")
-            logger.info(f"  發現: {results['discovered']}")
-            logger.info(f"  分析: {results['analyzed']}")
-            logger.info(f"  上傳: {results['uploaded']}")
-            logger.info("=" * 60)
-        
-        elif parsed_args.command == "discover":
-            count = pipeline.run_discovery(
-                min_word_count=parsed_args.min_words,
-                channel=parsed_args.channel
-            )
-            logger.info(f"發現 {count} 個待處理檔案")
-        
-        elif parsed_args.command == "analyze":
-            count = pipeline.run_analysis(prompt_template=parsed_args.template)
-            logger.info(f"分析 {count} 個檔案")
-        
-        elif parsed_args.command == "upload":
-            count = pipeline.run_upload(dry_run=parsed_args.dry_run)
-            logger.info(f"上傳 {count} 個檔案")
+        try:
+            # 執行命令
+            if parsed_args.command == "run":
+                results = pipeline.run_full_pipeline(
+                    prompt_template=parsed_args.template,
+                    dry_run=parsed_args.dry_run,
+                    channel=parsed_args.channel
+                )
+                logger.info("")
+                logger.info(_BANNER)
+                logger.info("Pipeline 完成")
+                logger.info("  發現: %s", results["discovered"])
+                logger.info("  分析: %s", results["analyzed"])
+                logger.info("  上傳: %s", results["uploaded"])
+                logger.info(_BANNER)
+            
+            elif parsed_args.command == "discover":
+                count = pipeline.run_discovery(
+                    min_word_count=parsed_args.min_words,
+                    channel=parsed_args.channel
+                )
+                logger.info("發現 %s 個待處理檔案", count)
+            
+            elif parsed_args.command == "analyze":
+                count = pipeline.run_analysis(prompt_template=parsed_args.template)
+                logger.info("分析 %s 個檔案", count)
+            
+            elif parsed_args.command == "upload":
+                count = pipeline.run_upload(dry_run=parsed_args.dry_run)
+                logger.info("上傳 %s 個檔案", count)
+        finally:
+            # 等待背景 insight 請求送出完畢並釋放 HTTP 連線（例外或中斷時也要執行）
+            pipeline.uploader.close()
+            pipeline.on_client.close()
         
         return 0
         
@@ -702,7 +967,7 @@ def main(args: Sequence[str] | None = None) -> int:
         logger.info("使用者中斷")
         return 130
     except Exception as e:
-        logger.error(f"執行錯誤: {e}")
+        logger.error("執行錯誤: %s", e)
         if parsed_args.verbose:
             import traceback
             traceback.print_exc()
@@ -8,6 +8,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import date, datetime
+from functools import cached_property
 from enum import Enum
 from pathlib import Path
 from typing import Any
@@ -63,7 +64,7 @@ class PipelineStatus(str, Enum):
 # ============================================================================
 
 
-@dataclass
+@dataclass(frozen=True)
 class TranscriptMetadata:
     """
     YouTube Transcriber 輸出的原始 metadata
@@ -82,9 +83,25 @@ class TranscriptMetadata:
     published_at: date
     duration: str
     word_count: int
+    
+    # 日期格式化結果在各階段重複使用（路徑、標題、frontmatter），首次存取後快取
+    @cached_property
+    def published_iso(self) -> str:
+        """published_at 的 ISO 格式（YYYY-MM-DD）"""
+        return self.published_at.isoformat()
+    
+    @cached_property
+    def published_ym(self) -> str:
+        """發布年月（YYYY-MM）"""
+        return self.published_at.strftime("%Y-%m")
+    
+    @cached_property
+    def published_ymd(self) -> str:
+        """發布日期（YYYYMMDD，用於檔名）"""
+        return self.published_at.strftime("%Y%m%d")
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptFile:
     """
     待處理的轉錄檔案
@@ -126,7 +143,7 @@ class TranscriptFile:
 # ============================================================================
 
 
-@dataclass
+@dataclass(frozen=True)
 class ProcessingMetadata:
     """
     Pipeline 處理中繼資料
@@ -144,9 +161,14 @@ class ProcessingMetadata:
     analyzed_at: datetime
     pipeline_version: str
     source_path: str
+    
+    @cached_property
+    def analyzed_iso(self) -> str:
+        """analyzed_at 的 ISO 格式（首次存取後快取）"""
+        return self.analyzed_at.isoformat()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ErrorInfo:
     """
     錯誤資訊
@@ -205,32 +227,36 @@ class AnalyzedTranscript:
             # 假設已經是 dict
             analysis_dict = analysis
         
-        # 組合 frontmatter，不包含中繼資料欄位
+        original = self.original
+        processing = self.processing
+        get = analysis_dict.get
+        
+        # 組合 frontmatter（dict literal 由直譯器一次建立，比逐筆插入或 dict(pairs) 快）
         frontmatter = {
             # 原始資訊
-            "channel": self.original.channel,
-            "video_id": self.original.video_id,
-            "title": self.original.title,
-            "published_at": self.original.published_at.isoformat(),
-            "duration": self.original.duration,
-            "word_count": self.original.word_count,
+            "channel": original.channel,
+            "video_id": original.video_id,
+            "title": original.title,
+            "published_at": original.published_iso,
+            "duration": original.duration,
+            "word_count": original.word_count,
             
             # 語意分析結果（來自 llm.AnalysisResult.to_dict()）
-            "semantic_summary": analysis_dict.get("semantic_summary"),
-            "key_topics": analysis_dict.get("key_topics"),
-            "suggested_topic": analysis_dict.get("suggested_topic"),
-            "content_type": analysis_dict.get("content_type"),
-            "content_density": analysis_dict.get("content_density"),
-            "temporal_relevance": analysis_dict.get("temporal_relevance"),
-            "dialogue_format": analysis_dict.get("dialogue_format"),
-            "segments": analysis_dict.get("segments"),
-            "key_entities": analysis_dict.get("key_entities"),
+            "semantic_summary": get("semantic_summary"),
+            "key_topics": get("key_topics"),
+            "suggested_topic": get("suggested_topic"),
+            "content_type": get("content_type"),
+            "content_density": get("content_density"),
+            "temporal_relevance": get("temporal_relevance"),
+            "dialogue_format": get("dialogue_format"),
+            "segments": get("segments"),
+            "key_entities": get("key_entities"),
             
             # 處理中繼資料
-            "analyzed_by": self.processing.analyzed_by,
-            "analyzed_at": self.processing.analyzed_at.isoformat(),
-            "pipeline_version": self.processing.pipeline_version,
-            "source_path": self.processing.source_path,
+            "analyzed_by": processing.analyzed_by,
+            "analyzed_at": processing.analyzed_iso,
+            "pipeline_version": processing.pipeline_version,
+            "source_path": processing.source_path,
             
             # Pipeline 狀態
             "status": self.status.value,
@@ -340,6 +366,37 @@ class AnalyzedTranscript:
 # Open Notebook API 相關模型
 # ============================================================================
 
+class SourceId(str):
+    """
+    Source ID（固定含 "source:" 前綴）
+    
+    在 API 邊界建構一次即完成前綴正規化；傳入已是 SourceId 的值時直接回傳原物件。
+    """
+    __slots__ = ()
+    
+    def __new__(cls, value: str) -> SourceId:
+        if type(value) is cls:
+            return value
+        if not value.startswith("source:"):
+            value = f"source:{value}"
+        return str.__new__(cls, value)
+
+
+class NotebookId(str):
+    """
+    Notebook ID（固定含 "notebook:" 前綴）
+    
+    在 API 邊界建構一次即完成前綴正規化；傳入已是 NotebookId 的值時直接回傳原物件。
+    """
+    __slots__ = ()
+    
+    def __new__(cls, value: str) -> NotebookId:
+        if type(value) is cls:
+            return value
+        if not value.startswith("notebook:"):
+            value = f"notebook:{value}"
+        return str.__new__(cls, value)
+
 
 @dataclass
 class OpenNotebookConfig:
@@ -349,9 +406,15 @@ class OpenNotebookConfig:
     Attributes:
         base_url: API Base URL (e.g., "http://localhost:5055")
         password: API 認證密碼（Bearer token）
+        supports_topics_on_create: 服務端是否接受在建立 Source 時帶入 topics
+            （目前的 Open Notebook 不接受，預設 False）
+        embeds_on_create: 服務端是否在以 embed=True 建立 Source 時自行排入嵌入
+            （僅在 supports_topics_on_create 時生效）
     """
     base_url: str
     password: str
+    supports_topics_on_create: bool = False
+    embeds_on_create: bool = False
 
 
 @dataclass
@@ -364,11 +427,13 @@ class SourceCreateRequest:
         title: Source 標題（格式: "{channel} | {title} | {published_at}"）
         content: 完整內容（含 frontmatter YAML + 轉錄內容）
         embed: 是否立即建立嵌入（建議先設為 False，待 topics 更新後再觸發）
+        topics: 建立時一併設定的 topics（僅限支援此欄位的服務端，None 表示不送出）
     """
     type: str  # "text", "link", "upload"
     title: str
     content: str
     embed: bool = False
+    topics: list[str] | None = None
 
 
 @dataclass
@@ -475,6 +540,9 @@ class PipelineConfig:
         max_concurrent: 同時處理檔案數（預設 3）
         retry_attempts: API 失敗重試次數（預設 3）
         retry_delay: 重試間隔秒數（預設 5）
+        max_inflight: 同時進行中的 Open Notebook API 請求上限（預設 8）
+        requests_per_second: Open Notebook API 每秒請求數上限（預設 5，0 表示不限制）
+        upload_journal: 上傳日誌 sqlite 路徑，中斷後重新執行時略過已完成的上傳（None 表示停用）
     """
     transcriber_output: Path
     intermediate: Path
@@ -484,6 +552,9 @@ class PipelineConfig:
     max_concurrent: int = 3
     retry_attempts: int = 3
     retry_delay: int = 5
+    max_inflight: int = 8
+    requests_per_second: float = 5.0
+    upload_journal: Path | None = None
 
 
 # ============================================================================
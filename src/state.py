@@ -6,25 +6,42 @@ Knowledge Pipeline - State 模組
 
 from __future__ import annotations
 
-import shutil
+import errno
+import functools
+import logging
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+try:
+    from yaml import CSafeDumper as YamlSafeDumper
+except ImportError:  # 未安裝 libyaml 時退回純 Python 版本
+    from yaml import SafeDumper as YamlSafeDumper
+
 from src.discovery import FrontmatterParser
-from src.llm import AnalysisResult
 from src.models import (
     AnalyzedTranscript,
     ErrorInfo,
+    NotebookId,
     PipelineStatus,
     ProcessingMetadata,
+    SourceId,
     TranscriptMetadata,
 )
 
 
+# 掛在 knowledge_pipeline 之下，沿用 setup_logging 設定的處理器
+logger = logging.getLogger("knowledge_pipeline.state")
+
+
 # ============================================================================
 # 例外定義
 # ============================================================================
@@ -49,6 +66,61 @@ class FileMoveError(StateError):
     pass
 
 
+# ============================================================================
+# Frontmatter 序列化與快速比對
+# ============================================================================
+
+# 頂層 status / source_id 欄位（可帶引號與行尾註解），用於免 YAML 解析的快速讀取
+_STATUS_RE = re.compile(rb"^status:[ \t]*([\"']?)([a-z_]+)\1[ \t]*(?:#.*)?$", re.M)
+_SOURCE_ID_RE = re.compile(
+    rb"^source_id:[ \t]*([\"']?)([A-Za-z_][\w:\-]*)\1[ \t]*(?:#.*)?$", re.M
+)
+
+class _FrontmatterDumper(YamlSafeDumper):
+    """frontmatter 專用 Dumper（於子類別註冊 representer，不影響全域 Dumper）"""
+    pass
+
+
+# PipelineStatus 直接以字串值輸出，寫入時不需先轉換 .value
+_FrontmatterDumper.add_representer(
+    PipelineStatus,
+    lambda dumper, status: dumper.represent_str(status.value)
+)
+
+
+# API 邊界的 ID 型別為 str 子類別，libyaml emitter 只接受 str，需先轉回一般字串
+def _represent_id(dumper: yaml.Dumper, value: str) -> yaml.ScalarNode:
+    return dumper.represent_str(str(value))
+
+
+_FrontmatterDumper.add_representer(SourceId, _represent_id)
+_FrontmatterDumper.add_representer(NotebookId, _represent_id)
+
+
+# frontmatter 序列化設定（保留欄位順序與非 ASCII 字元）；
+# PyYAML 的 Dumper 綁定輸出串流，無法跨呼叫重用，因此固定參數而非實例
+_dump_frontmatter = functools.partial(
+    yaml.dump,
+    Dumper=_FrontmatterDumper,
+    allow_unicode=True,
+    sort_keys=False,
+    default_flow_style=False,
+)
+
+# status 字串 → PipelineStatus 查表
+_STATUS_BY_VALUE: dict[str, PipelineStatus] = {status.value: status for status in PipelineStatus}
+
+# 可不加引號直接寫入的欄位值
+_PLAIN_VALUE_RE = re.compile(rb"[A-Za-z_][\w:\-]*")
+
+# 未加引號時會被 YAML 解讀為非字串的值，需交由完整解析處理
+_YAML_SPECIAL_SCALARS = frozenset({
+    b"null", b"Null", b"NULL", b"true", b"True", b"TRUE", b"false", b"False", b"FALSE",
+    b"yes", b"Yes", b"YES", b"no", b"No", b"NO", b"on", b"On", b"ON", b"off", b"Off", b"OFF",
+    b"y", b"Y", b"n", b"N",
+})
+
+
 # ============================================================================
 # File State
 # ============================================================================
@@ -81,8 +153,14 @@ class FrontmatterReader:
     Frontmatter 讀取器
     
     讀取 Markdown 檔案的 YAML frontmatter。
+    
+    解析結果以路徑為鍵快取，並記錄解析時的 (mtime, 大小)：外部改寫由兩者變化偵測，
+    FrontmatterWriter 寫入後則明確呼叫 invalidate()，不依賴檔案系統的時間精度。
     """
     
+    # 快取的檔案數上限（超過時淘汰最久未使用者）
+    CACHE_SIZE = 4096
+    
     def __init__(self, parser: FrontmatterParser | None = None):
         """
         初始化讀取器
@@ -91,13 +169,57 @@ class FrontmatterReader:
             parser: Frontmatter 解析器
         """
         self.parser = parser or FrontmatterParser()
+        # 路徑 -> ((mtime_ns, 大小), frontmatter)
+        self._cache: OrderedDict[str, tuple[tuple[int, int], dict]] = OrderedDict()
+        self._cache_lock = threading.Lock()
     
-    def read(self, filepath: Path) -> dict:
+    def _read_cached(self, path_str: str, mtime_ns: int, size: int) -> dict:
+        """
+        解析 frontmatter，(mtime, 大小) 與快取相同時直接重用
+        
+        只讀取 frontmatter 區塊，不載入整份逐字稿正文。
+        
+        Args:
+            path_str: 檔案路徑
+            mtime_ns: 檔案修改時間（奈秒）
+            size: 檔案大小
+            
+        Returns:
+            frontmatter 字典
+        """
+        key = (mtime_ns, size)
+        with self._cache_lock:
+            cached = self._cache.get(path_str)
+            if cached is not None and cached[0] == key:
+                self._cache.move_to_end(path_str)
+                return cached[1]
+        
+        frontmatter = self.parser.parse_file_frontmatter(Path(path_str))
+        
+        with self._cache_lock:
+            self._cache[path_str] = (key, frontmatter)
+            self._cache.move_to_end(path_str)
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return frontmatter
+    
+    def invalidate(self, filepath: Path) -> None:
+        """
+        移除單一檔案的快取（檔案被本行程改寫後呼叫）
+        
+        Args:
+            filepath: Markdown 檔案路徑
+        """
+        with self._cache_lock:
+            self._cache.pop(str(filepath), None)
+    
+    def read(self, filepath: Path, *, stat: os.stat_result | None = None) -> dict:
         """
         讀取 frontmatter
         
         Args:
             filepath: Markdown 檔案路徑
+            stat: 呼叫端已取得的 os.stat 結果（提供時不再重複 stat）
             
         Returns:
             frontmatter 字典（若無 frontmatter 則回傳空 dict）
@@ -108,12 +230,41 @@ class FrontmatterReader:
         """
         filepath = Path(filepath)
         
-        if not filepath.exists():
-            raise FileNotFoundError(f"檔案不存在: {filepath}")
+        if stat is None:
+            try:
+                stat = filepath.stat()
+            except FileNotFoundError:
+                raise FileNotFoundError(f"檔案不存在: {filepath}") from None
         
         try:
-            frontmatter, _ = self.parser.parse_file(filepath)
-            return frontmatter
+            frontmatter = self._read_cached(str(filepath), stat.st_mtime_ns, stat.st_size)
+        except Exception as e:
+            raise FrontmatterReadError(f"讀取 frontmatter 失敗: {e}") from e
+        
+        # 回傳淺複本，避免呼叫端修改到快取內容
+        return dict(frontmatter)
+    
+    def read_with_body(self, filepath: Path) -> tuple[dict, str]:
+        """
+        讀取 frontmatter 與正文
+        
+        供先讀取再寫入的流程使用，結果可直接傳給 FrontmatterWriter.write(parsed=...)。
+        正文可能很大，因此不進入快取。
+        
+        Args:
+            filepath: Markdown 檔案路徑
+            
+        Returns:
+            Tuple[frontmatter_dict, body_content]
+            
+        Raises:
+            FileNotFoundError: 檔案不存在
+            FrontmatterReadError: 讀取或解析失敗
+        """
+        try:
+            return self.parser.parse_file(Path(filepath))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"檔案不存在: {filepath}") from None
         except Exception as e:
             raise FrontmatterReadError(f"讀取 frontmatter 失敗: {e}") from e
     
@@ -121,7 +272,7 @@ class FrontmatterReader:
         """
         快速讀取 status 欄位
         
-        只解析 frontmatter 中的 status 欄位，避免完整解析。
+        先以正規表示式直接比對 frontmatter bytes，無法確定時才退回完整 YAML 解析。
         
         Args:
             filepath: Markdown 檔案路徑
@@ -129,18 +280,16 @@ class FrontmatterReader:
         Returns:
             PipelineStatus 或 None
         """
+        value = self._match_field(self._read_frontmatter_bytes(filepath), _STATUS_RE)
+        if value in _STATUS_BY_VALUE:
+            return _STATUS_BY_VALUE[value]
+        
         try:
             frontmatter = self.read(filepath)
-            status_str = frontmatter.get("status")
-            
-            if not status_str:
-                return None
-            
-            return PipelineStatus(status_str)
         except (FileNotFoundError, FrontmatterReadError):
             return None
-        except ValueError:
-            return None
+        
+        return self._status_from(frontmatter)
     
     def read_source_id(self, filepath: Path) -> str | None:
         """
@@ -152,11 +301,96 @@ class FrontmatterReader:
         Returns:
             source_id 字串或 None
         """
+        value = self._match_field(self._read_frontmatter_bytes(filepath), _SOURCE_ID_RE)
+        if value is not None:
+            return value
+        
         try:
             frontmatter = self.read(filepath)
             return frontmatter.get("source_id")
         except (FileNotFoundError, FrontmatterReadError):
             return None
+    
+    def read_status_and_source_id(
+        self,
+        filepath: Path
+    ) -> tuple[PipelineStatus | None, str | None]:
+        """
+        同時讀取 status 與 source_id 欄位
+        
+        兩個欄位共用一次 frontmatter 讀取；任一欄位無法以正規表示式確定時，
+        才退回一次完整 YAML 解析。
+        
+        Args:
+            filepath: Markdown 檔案路徑
+            
+        Returns:
+            Tuple[PipelineStatus 或 None, source_id 字串或 None]
+        """
+        frontmatter_bytes = self._read_frontmatter_bytes(filepath)
+        status_value = self._match_field(frontmatter_bytes, _STATUS_RE)
+        source_id = self._match_field(frontmatter_bytes, _SOURCE_ID_RE)
+        if status_value in _STATUS_BY_VALUE and source_id is not None:
+            return _STATUS_BY_VALUE[status_value], source_id
+        
+        try:
+            frontmatter = self.read(filepath)
+        except (FileNotFoundError, FrontmatterReadError):
+            return None, None
+        
+        return self._status_from(frontmatter), frontmatter.get("source_id")
+    
+    def _status_from(self, frontmatter: dict) -> PipelineStatus | None:
+        """
+        從 frontmatter 字典取得 status
+        
+        Args:
+            frontmatter: frontmatter 字典
+            
+        Returns:
+            PipelineStatus 或 None（欄位不存在或值無效）
+        """
+        status_str = frontmatter.get("status")
+        if not isinstance(status_str, str):
+            return None
+        
+        return _STATUS_BY_VALUE.get(status_str)
+    
+    def _read_frontmatter_bytes(self, filepath: Path) -> bytes:
+        """
+        讀取 frontmatter 原始 bytes，讀取失敗時回傳 b""（交由完整解析處理錯誤）
+        
+        Args:
+            filepath: Markdown 檔案路徑
+            
+        Returns:
+            frontmatter bytes
+        """
+        try:
+            return self.parser.read_frontmatter_bytes(Path(filepath))
+        except OSError:
+            return b""
+    
+    def _match_field(self, frontmatter_bytes: bytes, pattern: re.Pattern[bytes]) -> str | None:
+        """
+        以正規表示式從 frontmatter bytes 取出單一欄位值
+        
+        Args:
+            frontmatter_bytes: frontmatter 原始 bytes
+            pattern: 欄位比對規則（第 2 組為欄位值）
+            
+        Returns:
+            欄位值；未命中或需交由 YAML 判斷時回傳 None
+        """
+        match = pattern.search(frontmatter_bytes)
+        if match is None:
+            return None
+        
+        quote, value = match.group(1), match.group(2)
+        if not quote and value in _YAML_SPECIAL_SCALARS:
+            return None
+        
+        return value.decode("ascii")
 
 
 # ============================================================================
@@ -170,20 +404,28 @@ class FrontmatterWriter:
     更新 Markdown 檔案的 YAML frontmatter，保留正文內容。
     """
     
-    def __init__(self, parser: FrontmatterParser | None = None):
+    def __init__(
+        self,
+        parser: FrontmatterParser | None = None,
+        reader: FrontmatterReader | None = None
+    ):
         """
         初始化寫入器
         
         Args:
             parser: Frontmatter 解析器
+            reader: 寫入後需清除快取的讀取器
         """
         self.parser = parser or FrontmatterParser()
+        self.reader = reader
     
     def write(
         self,
         filepath: Path,
         updates: dict,
-        preserve_format: bool = True
+        preserve_format: bool = True,
+        *,
+        parsed: tuple[dict, str] | None = None
     ) -> None:
         """
         更新 frontmatter
@@ -192,6 +434,8 @@ class FrontmatterWriter:
             filepath: Markdown 檔案路徑
             updates: 要更新的欄位字典
             preserve_format: 是否盡量保留原始 YAML 格式
+            parsed: 呼叫端已取得的 (frontmatter, 正文)，例如 FrontmatterReader.read_with_body()
+                的結果；提供時略過重新解析，須與檔案目前內容一致
             
         Raises:
             FileNotFoundError: 檔案不存在
@@ -199,33 +443,97 @@ class FrontmatterWriter:
         """
         filepath = Path(filepath)
         
-        if not filepath.exists():
-            raise FileNotFoundError(f"檔案不存在: {filepath}")
+        try:
+            f = open(filepath, "r+b")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"檔案不存在: {filepath}") from None
         
         try:
-            # 讀取現有內容
-            content = filepath.read_text(encoding="utf-8")
-            frontmatter, body = self.parser.parse(content)
-            
-            # 更新 frontmatter
-            updated_frontmatter = {**frontmatter, **updates}
-            
-            # 序列化為 YAML
-            yaml_content = yaml.dump(
-                updated_frontmatter,
-                allow_unicode=True,
-                sort_keys=False,
-                default_flow_style=False
-            )
-            
-            # 組合新的 Markdown 內容
-            new_content = f"---\n{yaml_content}---\n\n{body}"
-            
-            # 寫入檔案
-            filepath.write_text(new_content, encoding="utf-8")
+            # 同一個檔案描述符完成讀取與改寫
+            with f:
+                raw = f.read()
+                if parsed is None:
+                    parsed = self.parser.parse(raw.decode("utf-8"))
+                frontmatter, body = parsed
+                
+                # 更新 frontmatter
+                updated_frontmatter = {**frontmatter, **updates}
+                
+                # 序列化為 YAML（直接輸出 UTF-8 bytes）
+                yaml_bytes = _dump_frontmatter(updated_frontmatter, encoding="utf-8")
+                
+                # 正文只編碼一次，比對與寫入共用
+                header = b"---\n" + yaml_bytes + b"---"
+                body_bytes = body.encode("utf-8")
+                old_header_length = self._header_length(raw, body_bytes)
+                f.seek(0)
+                
+                if old_header_length is not None and len(header) <= old_header_length:
+                    # 新 frontmatter 放得下：在最後一行行尾補空白，只覆寫 frontmatter 區塊
+                    padding = b" " * (old_header_length - len(header))
+                    f.writelines((header[:-4], padding, header[-4:]))
+                else:
+                    # 分段寫入新的 Markdown 內容，不另外串接出完整檔案
+                    f.writelines((header, b"\n\n", body_bytes))
+                    f.truncate()
             
         except Exception as e:
             raise FrontmatterWriteError(f"寫入 frontmatter 失敗: {e}") from e
+        finally:
+            self._invalidate(filepath)
+    
+    def _invalidate(self, filepath: Path) -> None:
+        """
+        清除讀取器中此檔案的快取
+        
+        Args:
+            filepath: Markdown 檔案路徑
+        """
+        if self.reader is not None:
+            self.reader.invalidate(filepath)
+    
+    def _header_length(self, raw: bytes, body_bytes: bytes) -> int | None:
+        """
+        取得既有 frontmatter 區塊（含前後 ---）的 byte 長度
+        
+        只有檔案已是寫入器輸出的格式（--- 區塊後空一行接正文）時，
+        才能原地覆寫 frontmatter 而不搬動正文。
+        
+        Args:
+            raw: 檔案原始內容
+            body_bytes: parse() 取得的正文（UTF-8 編碼）
+            
+        Returns:
+            frontmatter 區塊長度；格式不符時回傳 None
+        """
+        if not raw.startswith(b"---\n"):
+            return None
+        
+        end = raw.find(b"\n---", 3)
+        if end == -1:
+            return None
+        
+        header_end = end + 4
+        if (
+            len(raw) != header_end + 2 + len(body_bytes)
+            or raw[header_end:header_end + 2] != b"\n\n"
+            or not raw.endswith(body_bytes)
+        ):
+            return None
+        
+        return header_end
+    
+    def write_many(self, filepath: Path, **updates: Any) -> None:
+        """
+        一次更新多個欄位
+        
+        狀態轉換需同時改動多個欄位時使用，只需一次讀取、解析與寫入。
+        
+        Args:
+            filepath: Markdown 檔案路徑
+            **updates: 要更新的欄位
+        """
+        self.write(filepath, updates)
     
     def write_status(
         self,
@@ -239,7 +547,8 @@ class FrontmatterWriter:
             filepath: Markdown 檔案路徑
             status: 新狀態
         """
-        self.write(filepath, {"status": status.value})
+        if not self.patch_status(filepath, status):
+            self.write(filepath, {"status": status.value})
     
     def write_source_id(
         self,
@@ -253,7 +562,8 @@ class FrontmatterWriter:
             filepath: Markdown 檔案路徑
             source_id: Source ID
         """
-        self.write(filepath, {"source_id": source_id})
+        if not self.patch_source_id(filepath, source_id):
+            self.write(filepath, {"source_id": source_id})
     
     def write_error(
         self,
@@ -270,12 +580,88 @@ class FrontmatterWriter:
             error: 錯誤資訊
         """
         error_dict = {
-            "error": error.message,
-            "error_code": error.code,
-            "failed_at": error.timestamp.isoformat() if error.timestamp else datetime.now().isoformat(),
+            "error": error.error,
+            "error_code": error.error_code,
+            "failed_at": error.failed_at.isoformat() if error.failed_at else datetime.now().isoformat(),
             "status": PipelineStatus.FAILED.value
         }
         self.write(filepath, error_dict)
+    
+    def patch_status(self, filepath: Path, status: PipelineStatus) -> bool:
+        """
+        直接在 bytes 層級改寫 status 值（不經 YAML 解析與序列化）
+        
+        Args:
+            filepath: Markdown 檔案路徑
+            status: 新狀態
+            
+        Returns:
+            True 表示已原地改寫；False 表示需改用 write()
+        """
+        return self._patch_field(filepath, _STATUS_RE, status.value)
+    
+    def patch_source_id(self, filepath: Path, source_id: str) -> bool:
+        """
+        直接在 bytes 層級改寫 source_id 值（不經 YAML 解析與序列化）
+        
+        Args:
+            filepath: Markdown 檔案路徑
+            source_id: Source ID
+            
+        Returns:
+            True 表示已原地改寫；False 表示需改用 write()
+        """
+        return self._patch_field(filepath, _SOURCE_ID_RE, source_id)
+    
+    def _patch_field(self, filepath: Path, pattern: re.Pattern[bytes], value: str) -> bool:
+        """
+        原地改寫 frontmatter 中的單一欄位值
+        
+        僅在欄位已存在、新值可直接作為 YAML 純量寫入，且長度不超過舊值時改寫，
+        不足的長度以行尾空白補齊，檔案其餘 bytes 不變。
+        
+        Args:
+            filepath: Markdown 檔案路徑
+            pattern: 欄位比對規則（第 1 組為引號，第 2 組為欄位值）
+            value: 新的欄位值
+            
+        Returns:
+            True 表示已原地改寫
+        """
+        new_value = value.encode("utf-8")
+        if not _PLAIN_VALUE_RE.fullmatch(new_value) or new_value in _YAML_SPECIAL_SCALARS:
+            return False
+        
+        filepath = Path(filepath)
+        
+        try:
+            with open(filepath, "r+b") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return False
+                
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    span = self.parser.find_frontmatter_span(mm)
+                    if span is None:
+                        return False
+                    match = pattern.search(mm, *span)
+                    if match is None:
+                        return False
+                    start = match.start(1)
+                    end = match.end(2) + len(match.group(1))
+                
+                if len(new_value) > end - start:
+                    return False
+                
+                # 以一般寫入（而非 mmap）改寫，確保 mtime 立即更新
+                f.seek(start)
+                f.write(new_value.ljust(end - start))
+            
+            return True
+            
+        except (OSError, ValueError):
+            return False
+        finally:
+            self._invalidate(filepath)
 
 
 # ============================================================================
@@ -310,10 +696,9 @@ class IdempotencyChecker:
         Returns:
             True 表示已處理（應該跳過）
         """
-        status = self.reader.read_status(filepath)
-        source_id = self.reader.read_source_id(filepath)
+        status, source_id = self.reader.read_status_and_source_id(filepath)
         
-        return status == PipelineStatus.UPLOADED and source_id is not None
+        return status is PipelineStatus.UPLOADED and source_id is not None
     
     def is_pending(self, filepath: Path) -> bool:
         """
@@ -394,6 +779,11 @@ class FileMover:
     負責在不同狀態目錄間搬移檔案。
     """
     
+    def __init__(self):
+        """初始化搬移器"""
+        # 已確認存在的目錄，避免對同一 channel/年月重複 mkdir
+        self._known_dirs: set[Path] = set()
+    
     def move_to_pending(
         self,
         source_path: Path,
@@ -458,12 +848,15 @@ class FileMover:
             
             target_path = target_dir / source_path.name
             
-            # 如果目標已存在，先刪除
-            if target_path.exists():
-                target_path.unlink()
-            
-            # 搬移檔案
-            shutil.move(str(source_path), str(target_path))
+            try:
+                # 同一檔案系統內以單一 rename 完成，並原子性覆寫既有目標
+                os.replace(source_path, target_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                # 跨裝置時退回複製後刪除（僅此情況需要 shutil，延遲匯入）
+                import shutil
+                shutil.move(str(source_path), str(target_path))
             
             return target_path
             
@@ -477,7 +870,11 @@ class FileMover:
         Args:
             path: 目錄路徑
         """
+        if path in self._known_dirs:
+            return
+        
         path.mkdir(parents=True, exist_ok=True)
+        self._known_dirs.add(path)
 
 
 # ============================================================================
@@ -521,23 +918,16 @@ class StatePersistence:
         # 構建 frontmatter
         frontmatter = self._build_frontmatter(analyzed)
         
-        # 序列化為 YAML
-        yaml_content = yaml.dump(
-            frontmatter,
-            allow_unicode=True,
-            sort_keys=False,
-            default_flow_style=False
-        )
-        
-        # 組合 Markdown 內容
         # 內容部分需要重新取得，AnalyzedTranscript 不直接儲存內容
         # 這裡我們需要從原始路徑讀取內容，或從其他來源取得
         content = self._get_content(analyzed)
         
-        markdown_content = f"---\n{yaml_content}---\n\n{content}"
-        
-        # 寫入檔案
-        filepath.write_text(markdown_content, encoding="utf-8")
+        # 依序寫入檔案：YAML 直接序列化至檔案串流，不先組成完整字串
+        with open(filepath, "wb") as f:
+            f.write(b"---\n")
+            _dump_frontmatter(frontmatter, stream=f, encoding="utf-8")
+            f.write(b"---\n\n")
+            f.write(content.encode("utf-8"))
     
     def _build_frontmatter(self, analyzed: AnalyzedTranscript) -> dict:
         """
@@ -558,7 +948,7 @@ class StatePersistence:
             "channel": original.channel,
             "video_id": original.video_id,
             "title": original.title,
-            "published_at": original.published_at.isoformat(),
+            "published_at": original.published_iso,
             "duration": original.duration,
             "word_count": original.word_count,
             
@@ -590,21 +980,21 @@ class StatePersistence:
         
         # 處理中繼資料
         frontmatter["analyzed_by"] = processing.analyzed_by
-        frontmatter["analyzed_at"] = processing.analyzed_at.isoformat()
+        frontmatter["analyzed_at"] = processing.analyzed_iso
         frontmatter["pipeline_version"] = processing.pipeline_version
         frontmatter["source_path"] = processing.source_path
         
         # Pipeline 狀態
-        frontmatter["status"] = analyzed.status.value
+        frontmatter["status"] = analyzed.status
         
         if analyzed.source_id:
             frontmatter["source_id"] = analyzed.source_id
         
         if analyzed.error:
-            frontmatter["error"] = analyzed.error.message
-            frontmatter["error_code"] = analyzed.error.code
-            if analyzed.error.timestamp:
-                frontmatter["failed_at"] = analyzed.error.timestamp.isoformat()
+            frontmatter["error"] = analyzed.error.error
+            frontmatter["error_code"] = analyzed.error.error_code
+            if analyzed.error.failed_at:
+                frontmatter["failed_at"] = analyzed.error.failed_at.isoformat()
         
         return frontmatter
     
@@ -623,14 +1013,12 @@ class StatePersistence:
         """
         # 從原始路徑讀取內容
         source_path = Path(analyzed.processing.source_path)
-        if source_path.exists():
-            try:
-                _, content = self.parser.parse_file(source_path)
-                return content
-            except Exception:
-                pass
-        
-        return ""
+        try:
+            _, content = self.parser.parse_file(source_path)
+            return content
+        except Exception:
+            # 原始檔案不存在或無法解析
+            return ""
     
     def load_analyzed_transcript(
         self,
@@ -641,13 +1029,15 @@ class StatePersistence:
         
         從 Markdown 檔案解析 AnalyzedTranscript。
         
+        只解析 frontmatter，正文由上傳階段按需讀取。
+        
         Args:
             filepath: 檔案路徑
             
         Returns:
             AnalyzedTranscript 實例
         """
-        frontmatter, content = self.parser.parse_file(filepath)
+        frontmatter = self.parser.parse_file_frontmatter(filepath)
         
         # 解析原始資訊
         original = TranscriptMetadata(
@@ -659,8 +1049,8 @@ class StatePersistence:
             word_count=frontmatter.get("word_count", 0) or 0
         )
         
-        # 解析分析結果
-        from src.llm.models import Segment
+        # 解析分析結果（延遲匯入，未載入分析結果的 CLI 流程不需載入 LLM 模組）
+        from src.llm.models import AnalysisResult, Segment
         
         segments = None
         if "segments" in frontmatter and frontmatter["segments"]:
@@ -704,9 +1094,9 @@ class StatePersistence:
         error = None
         if "error" in frontmatter:
             error = ErrorInfo(
-                message=frontmatter["error"],
-                code=frontmatter.get("error_code", ""),
-                timestamp=self._parse_datetime(frontmatter.get("failed_at"))
+                error=frontmatter["error"],
+                error_code=frontmatter.get("error_code", ""),
+                failed_at=self._parse_datetime(frontmatter.get("failed_at"))
             )
         
         return AnalyzedTranscript(
@@ -718,8 +1108,15 @@ class StatePersistence:
             source_id=source_id
         )
     
-    def _parse_date(self, date_value) -> datetime:
+    def _parse_date(self, date_value) -> date:
         """解析日期值"""
+        # 常見型別以 type() 直接比對：YAML 通常已將 YYYY-MM-DD 解析為 date
+        value_type = type(date_value)
+        if value_type is date:
+            return date_value
+        if value_type is str:
+            return datetime.fromisoformat(date_value).date()
+        
         if isinstance(date_value, datetime):
             return date_value.date()
         if isinstance(date_value, str):
@@ -728,6 +1125,12 @@ class StatePersistence:
     
     def _parse_datetime(self, dt_value) -> datetime:
         """解析日期時間值"""
+        value_type = type(dt_value)
+        if value_type is datetime:
+            return dt_value
+        if value_type is str:
+            return datetime.fromisoformat(dt_value)
+        
         if isinstance(dt_value, datetime):
             return dt_value
         if isinstance(dt_value, str):
@@ -739,6 +1142,11 @@ class StatePersistence:
 # State Manager
 # ============================================================================
 
+# 檔名 slug：移除的字元與合併為 hyphen 的分隔字元
+_SLUG_NON_WORD_RE = re.compile(r"[^\w\s-]")
+_SLUG_SEPARATOR_RE = re.compile(r"[-\s]+")
+
+
 class StateManager:
     """
     狀態管理器
@@ -765,7 +1173,7 @@ class StateManager:
             persistence: 狀態持久化器
         """
         self.reader = reader or FrontmatterReader()
-        self.writer = writer or FrontmatterWriter()
+        self.writer = writer or FrontmatterWriter(reader=self.reader)
         self.checker = checker or IdempotencyChecker(self.reader)
         self.mover = mover or FileMover()
         self.persistence = persistence or StatePersistence()
@@ -792,7 +1200,7 @@ class StateManager:
         original = analyzed.original
         
         # 計算年月
-        year_month = original.published_at.strftime("%Y-%m")
+        year_month = original.published_ym
         
         # 構建輸出路徑
         output_path = self._build_output_path(
@@ -825,7 +1233,9 @@ class StateManager:
         filepath: Path,
         source_id: str,
         intermediate_dir: Path,
-        original_filepath: Path | None = None
+        original_filepath: Path | None = None,
+        channel: str | None = None,
+        year_month: str | None = None
     ) -> Path:
         """
         標記為已上傳狀態
@@ -841,25 +1251,51 @@ class StateManager:
             source_id: Source ID
             intermediate_dir: intermediate 根目錄
             original_filepath: 原始字幕檔案路徑（若提供，會同步更新其 frontmatter）
+            channel: 頻道名稱（與 year_month 同時提供時不再解讀 frontmatter）
+            year_month: 發布年月 YYYY-MM（呼叫端已知時提供）
             
         Returns:
             搬移後的檔案路徑
         """
-        # 更新狀態和 source_id
-        self.writer.write_status(filepath, PipelineStatus.UPLOADED)
-        self.writer.write_source_id(filepath, source_id)
+        uploaded = {"status": PipelineStatus.UPLOADED, "source_id": source_id}
+        
+        if channel is not None and year_month is not None:
+            # 搬移目錄已知，只需更新狀態和 source_id
+            self.writer.write(filepath, uploaded)
+        else:
+            # 讀取一次 frontmatter 與正文，寫入與後續取得 channel/published_at 共用
+            frontmatter, body = self.reader.read_with_body(filepath)
+            self.writer.write(filepath, uploaded, parsed=(frontmatter, body))
+            
+            channel, year_month = self._approved_location(frontmatter)
         
         # 同步更新原始字幕檔案的 frontmatter（若提供路徑）
-        if original_filepath and original_filepath.exists():
+        if original_filepath:
             try:
-                self.writer.write_status(original_filepath, PipelineStatus.UPLOADED)
-                self.writer.write_source_id(original_filepath, source_id)
+                self.writer.write_many(original_filepath, **uploaded)
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 # 記錄錯誤但不影響主要流程
-                print(f"警告: 無法更新原始檔案狀態 {original_filepath}: {e}")
+                logger.warning("無法更新原始檔案狀態 %s: %s", original_filepath, e)
+        
+        # 搬移到 approved 目錄
+        target_path = self.mover.move_to_approved(
+            filepath, intermediate_dir, channel, year_month
+        )
         
-        # 讀取 frontmatter 以取得 channel 和 published_at
-        frontmatter = self.reader.read(filepath)
+        return target_path
+    
+    def _approved_location(self, frontmatter: dict) -> tuple[str, str]:
+        """
+        從 frontmatter 取得 approved 目錄的 channel 與年月
+        
+        Args:
+            frontmatter: frontmatter 字典
+            
+        Returns:
+            Tuple[channel, YYYY-MM]
+        """
         channel = frontmatter.get("channel", "unknown")
         published_at_str = frontmatter.get("published_at", "")
         
@@ -870,12 +1306,7 @@ class StateManager:
         except (ValueError, TypeError):
             year_month = datetime.now().strftime("%Y-%m")
         
-        # 搬移到 approved 目錄
-        target_path = self.mover.move_to_approved(
-            filepath, intermediate_dir, channel, year_month
-        )
-        
-        return target_path
+        return channel, year_month
     
     def mark_as_failed(
         self,
@@ -898,9 +1329,9 @@ class StateManager:
             error_code: 錯誤代碼
         """
         error_info = ErrorInfo(
-            message=error,
-            code=error_code,
-            timestamp=datetime.now()
+            error=error,
+            error_code=error_code,
+            failed_at=datetime.now()
         )
         self.writer.write_error(filepath, error_info)
     
@@ -914,21 +1345,32 @@ class StateManager:
         Returns:
             FileState 實例
         """
-        status = self.reader.read_status(filepath)
-        source_id = self.reader.read_source_id(filepath)
-        
-        # 檢查錯誤資訊
-        error = None
+        # 只 stat 一次；錯誤資訊本來就需要完整 frontmatter，status 與 source_id 直接取自同一份字典
+        status = source_id = error = None
         try:
-            frontmatter = self.reader.read(filepath)
-            if "error" in frontmatter:
-                error = ErrorInfo(
-                    message=frontmatter["error"],
-                    code=frontmatter.get("error_code", ""),
-                    timestamp=datetime.fromisoformat(frontmatter["failed_at"]) if "failed_at" in frontmatter else None
-                )
-        except Exception:
-            pass
+            stat = filepath.stat()
+        except OSError:
+            stat = None
+        
+        if stat is not None:
+            try:
+                frontmatter = self.reader.read(filepath, stat=stat)
+            except (FileNotFoundError, FrontmatterReadError):
+                status, source_id = self.reader.read_status_and_source_id(filepath)
+            else:
+                status = self.reader._status_from(frontmatter)
+                source_id = frontmatter.get("source_id")
+                
+                # 檢查錯誤資訊
+                if "error" in frontmatter:
+                    try:
+                        error = ErrorInfo(
+                            error=frontmatter["error"],
+                            error_code=frontmatter.get("error_code", ""),
+                            failed_at=datetime.fromisoformat(frontmatter["failed_at"]) if "failed_at" in frontmatter else None
+                        )
+                    except Exception:
+                        pass
         
         # 判斷是否可以處理
         can_process = False
@@ -967,7 +1409,7 @@ class StateManager:
         
         # 檔名格式: {published_at}_{video_id}_{slug}_analyzed.md
         filename = (
-            f"{metadata.published_at.strftime('%Y%m%d')}"
+            f"{metadata.published_ymd}"
             f"_{metadata.video_id}"
             f"_{slug}"
             f"_analyzed.md"
@@ -986,8 +1428,7 @@ class StateManager:
         Returns:
             slug 字串
         """
-        import re
         # 移除非 alphanumeric 字元，保留 hyphen
-        slug = re.sub(r"[^\w\s-]", "", text)
-        slug = re.sub(r"[-\s]+", "-", slug)
+        slug = _SLUG_NON_WORD_RE.sub("", text)
+        slug = _SLUG_SEPARATOR_RE.sub("-", slug)
         return slug[:max_length].strip("-")
@@ -6,26 +6,57 @@ Knowledge Pipeline - Uploader 模組
 
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
+import random
+import sqlite3
+import threading
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
-from urllib.parse import urljoin
+from typing import Any, Callable, Sequence
+from urllib.parse import urljoin, urlsplit
 
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+
+try:
+    from yaml import CSafeDumper as YamlSafeDumper
+except ImportError:  # 未安裝 libyaml 時退回純 Python 版本
+    from yaml import SafeDumper as YamlSafeDumper
+
+try:
+    import orjson
+    
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:  # 未安裝 orjson 時退回標準庫
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    
+    _json_loads = json.loads
 
 from src.models import (
     AnalyzedTranscript,
+    NotebookId,
     NotebookLinkRequest,
     OpenNotebookConfig,
     SourceCreateRequest,
     SourceCreateResponse,
+    SourceId,
     SourceUpdateRequest,
 )
 
 
+# 掛在 knowledge_pipeline 之下，沿用 setup_logging 設定的處理器
+logger = logging.getLogger("knowledge_pipeline.uploader")
+
+
 # ============================================================================
 # 例外定義
 # ============================================================================
@@ -67,21 +98,58 @@ class RateLimitError(APIError):
 # Upload Result & Statistics
 # ============================================================================
 
-@dataclass
 class UploadResult:
     """
     單個上傳結果
     
+    大批次時每筆都會建立一個結果，故使用 __slots__ 並延後格式化錯誤訊息：
+    失敗時只保存例外，讀取 error 時才轉為字串。error 需同時可由建構子傳入並以
+    property 延後產生，dataclass 欄位無法與同名 property 並存，故手寫 __init__。
+    
     Attributes:
         success: 是否成功
         source_id: Source ID（成功時有值）
-        error: 錯誤訊息（失敗時有值）
+        error: 錯誤訊息（失敗時有值；僅提供例外時於首次讀取時產生）
         error_code: 錯誤代碼（失敗時有值）
     """
-    success: bool
-    source_id: str | None = None
-    error: str | None = None
-    error_code: str | None = None
+    __slots__ = ("success", "source_id", "error_code", "_error", "_exc")
+    
+    def __init__(
+        self,
+        success: bool,
+        source_id: str | None = None,
+        error: str | None = None,
+        error_code: str | None = None,
+        exc: BaseException | None = None
+    ):
+        self.success = success
+        self.source_id = source_id
+        self.error_code = error_code
+        self._error = error
+        self._exc = exc
+    
+    @property
+    def error(self) -> str | None:
+        """錯誤訊息（首次讀取時由例外格式化）"""
+        if self._error is None and self._exc is not None:
+            self._error = str(self._exc)
+        return self._error
+    
+    def __repr__(self) -> str:
+        return (
+            f"UploadResult(success={self.success!r}, source_id={self.source_id!r}, "
+            f"error={self.error!r}, error_code={self.error_code!r})"
+        )
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, UploadResult):
+            return NotImplemented
+        return (
+            (self.success, self.source_id, self.error, self.error_code)
+            == (other.success, other.source_id, other.error, other.error_code)
+        )
+    
+    __hash__ = None
 
 
 @dataclass
@@ -95,12 +163,14 @@ class UploadStatistics:
         failed: 失敗數
         retried: 發生重試的次數
         avg_duration_ms: 平均上傳耗時（毫秒）
+        cache_hits: 內容相同而直接沿用既有 Source 的次數
     """
     total_uploaded: int = 0
     successful: int = 0
     failed: int = 0
     retried: int = 0
     avg_duration_ms: float = 0.0
+    cache_hits: int = 0
 
 
 # ============================================================================
@@ -118,12 +188,15 @@ class FixedDelayRetry:
     - 5xx 錯誤
     - 429 Rate Limit
     - Timeout
+    
+    若回應帶有 Retry-After header，以伺服器指定的秒數取代固定延遲。
     """
     
     def __init__(
         self,
         max_attempts: int = 3,
-        delay: float = 5.0
+        delay: float = 5.0,
+        total_budget: float | None = None
     ):
         """
         初始化重試策略
@@ -131,9 +204,11 @@ class FixedDelayRetry:
         Args:
             max_attempts: 最大嘗試次數
             delay: 重試延遲（秒）
+            total_budget: 單一請求（含所有重試）的總時間上限（秒），None 表示不限制
         """
         self.max_attempts = max_attempts
         self.delay = delay
+        self.total_budget = total_budget
     
     def should_retry(self, status_code: int | None, attempt: int) -> bool:
         """
@@ -163,17 +238,137 @@ class FixedDelayRetry:
         
         return False
     
-    def get_delay(self, attempt: int) -> float:
+    def get_delay(self, attempt: int, response: requests.Response | None = None) -> float:
         """
         取得重試延遲時間
         
         Args:
             attempt: 當前嘗試次數
+            response: 觸發重試的回應（用於讀取 Retry-After）
             
         Returns:
             延遲秒數
         """
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            return retry_after
         return self.delay
+    
+    def _retry_after(self, response: requests.Response | None) -> float | None:
+        """
+        讀取回應的 Retry-After 秒數
+        
+        Args:
+            response: 觸發重試的回應
+            
+        Returns:
+            秒數；無此 header 或為 HTTP-date 格式時回傳 None
+        """
+        if response is None:
+            return None
+        retry_after = response.headers.get("Retry-After")
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            # HTTP-date 格式不解析
+            return None
+
+
+class ExponentialBackoffRetry(FixedDelayRetry):
+    """
+    指數退避 + 隨機抖動重試策略
+    
+    延遲為 min(max_delay, base_delay * 2^(attempt-1)) 再加上 [0, base_delay) 的抖動，
+    例如：0.5s -> 1s -> 2s（各加抖動）。多個執行緒同時遇到 429/503 時，
+    抖動可錯開重試時間，避免同時再次湧入。
+    
+    重試條件與 Retry-After 處理同 FixedDelayRetry。
+    """
+    
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        total_budget: float | None = None
+    ):
+        """
+        初始化重試策略
+        
+        Args:
+            max_attempts: 最大嘗試次數
+            base_delay: 第一次重試的基準延遲（秒），亦為抖動上限
+            max_delay: 退避延遲上限（秒，不含抖動）
+            total_budget: 單一請求（含所有重試）的總時間上限（秒），None 表示不限制
+        """
+        super().__init__(max_attempts, base_delay, total_budget)
+        self.max_delay = max_delay
+    
+    def get_delay(self, attempt: int, response: requests.Response | None = None) -> float:
+        """
+        取得重試延遲時間
+        
+        Args:
+            attempt: 當前嘗試次數
+            response: 觸發重試的回應（用於讀取 Retry-After）
+            
+        Returns:
+            延遲秒數
+        """
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            return retry_after
+        backoff = min(self.max_delay, self.delay * (2 ** (attempt - 1)))
+        return backoff + random.uniform(0, self.delay)
+
+
+# ============================================================================
+# Rate Limiting
+# ============================================================================
+
+class _RateLimiter:
+    """
+    滑動視窗速率限制器（執行緒安全）
+    
+    任意 window 秒內最多放行 capacity 個請求，window = capacity / rps；
+    額度用完時 acquire() 會等待最早的請求離開視窗。
+    """
+    
+    def __init__(self, rps: float):
+        """
+        初始化限制器
+        
+        Args:
+            rps: 每秒請求數上限（須大於 0）
+        """
+        self.capacity = max(1, int(rps))
+        self.window = self.capacity / rps
+        self._timestamps: deque[float] = deque()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """取得一個請求額度，必要時等待"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                timestamps = self._timestamps
+                while timestamps and now - timestamps[0] >= self.window:
+                    timestamps.popleft()
+                if len(timestamps) < self.capacity:
+                    timestamps.append(now)
+                    return
+                wait = self.window - (now - timestamps[0])
+            # 在鎖外等待，讓其他執行緒可同時檢查額度
+            time.sleep(wait)
+    
+    def __enter__(self) -> _RateLimiter:
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
 
 
 # ============================================================================
@@ -187,10 +382,18 @@ class OpenNotebookClient:
     封裝所有 ON API 呼叫，處理認證與錯誤重試。
     """
     
+    # 無參數 GET 端點的回應快取時間（秒）
+    GET_CACHE_TTL = 300.0
+    
     def __init__(
         self,
         config: OpenNotebookConfig,
-        retry_strategy: FixedDelayRetry | None = None
+        retry_strategy: FixedDelayRetry | None = None,
+        pool_maxsize: int = 10,
+        max_inflight: int | None = None,
+        requests_per_second: float | None = None,
+        supports_topics_on_create: bool = False,
+        embeds_on_create: bool = False
     ):
         """
         初始化客戶端
@@ -198,16 +401,73 @@ class OpenNotebookClient:
         Args:
             config: Open Notebook 配置
             retry_strategy: 重試策略
+            pool_maxsize: 連線池保留的 keep-alive 連線數（應不小於並行上傳數）
+            max_inflight: 同時進行中的請求上限，None 表示不限制
+            requests_per_second: 每秒請求數上限，None 或 0 表示不限制
+            supports_topics_on_create: 服務端是否接受在建立 Source 時帶入 topics
+                （目前的 Open Notebook 不接受，預設 False）
+            embeds_on_create: 服務端是否在以 embed=True 建立 Source 時自行排入嵌入
         """
         self.config = config
         self.retry_strategy = retry_strategy or FixedDelayRetry()
+        self.supports_topics_on_create = supports_topics_on_create
+        self.embeds_on_create = embeds_on_create
+        # 連線池至少容納所有允許同時進行的請求，否則多出的連線用完即關，下次請求需重新握手
+        if max_inflight:
+            pool_maxsize = max(pool_maxsize, max_inflight)
+        self.pool_maxsize = pool_maxsize
         self.session = requests.Session()
         
+        # 端點皆為絕對路徑（/api/...），urljoin 只保留 scheme 與 host，預先算好以字串串接
+        base = urlsplit(config.base_url)
+        self._origin = f"{base.scheme}://{base.netloc}"
+        
+        # 連線池大小配合並行上傳數，讓每個執行緒都能重用既有連線；
+        # 重試由 retry_strategy 處理，adapter 本身不重試
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
         # 設定認證 header
         self.session.headers.update({
             "Authorization": f"Bearer {config.password}",
             "Content-Type": "application/json"
         })
+        
+        # 全域並行上限與速率限制：所有執行緒（含背景 insights）共用，
+        # 只包住實際送出的請求，重試等待期間不佔用額度
+        self._inflight = (
+            threading.BoundedSemaphore(max_inflight) if max_inflight else nullcontext()
+        )
+        self._limiter = (
+            _RateLimiter(requests_per_second) if requests_per_second else nullcontext()
+        )
+        
+        # 累計重試次數（供 UploadStatistics.retried 使用）與收到 429 的次數
+        self.retry_count = 0
+        self.rate_limited_count = 0
+        self._retry_lock = threading.Lock()
+        
+        # 端點 -> (到期時間, 回應)，見 _cached_get
+        self._get_cache: dict[str, tuple[float, Any]] = {}
+        
+        # Notebook 名稱 -> ID（首次查詢時由 GET /api/notebooks 填入）
+        self._notebook_id_cache: dict[str, NotebookId] = {}
+        self._notebook_list_loaded = False
+    
+    def _url(self, endpoint: str) -> str:
+        """
+        組合完整 URL
+        
+        Args:
+            endpoint: API 端點（不含 base_url）
+            
+        Returns:
+            完整 URL
+        """
+        if endpoint.startswith("/"):
+            return self._origin + endpoint
+        return urljoin(self.config.base_url, endpoint)
     
     def _make_request(
         self,
@@ -233,15 +493,26 @@ class OpenNotebookClient:
             NotebookNotFoundError: Notebook 不存在
             RateLimitError: 速率限制
         """
-        url = urljoin(self.config.base_url, endpoint)
+        url = self._url(endpoint)
+        
+        # 請求本體只序列化一次（重試時重用），Content-Type 已由 session header 設定
+        if "json" in kwargs:
+            kwargs["data"] = _json_dumps(kwargs.pop("json"))
         
-        for attempt in range(1, self.retry_strategy.max_attempts + 1):
+        retry = self.retry_strategy
+        deadline = (
+            time.monotonic() + retry.total_budget
+            if retry.total_budget is not None else None
+        )
+        
+        for attempt in range(1, retry.max_attempts + 1):
             try:
-                response = self.session.request(method, url, **kwargs)
+                with self._limiter, self._inflight:
+                    response = self.session.request(method, url, **kwargs)
                 
                 # 檢查狀態碼
                 if response.status_code == 200 or response.status_code == 201:
-                    return response.json() if response.text else {}
+                    return _json_loads(response.content) if response.content else {}
                 
                 if response.status_code == 401:
                     raise AuthenticationError("認證失敗，請檢查 API 密碼")
@@ -253,14 +524,20 @@ class OpenNotebookClient:
                         raise SourceNotFoundError(f"Source 不存在: {endpoint}")
                 
                 if response.status_code == 429:
-                    if self.retry_strategy.should_retry(429, attempt):
-                        time.sleep(self.retry_strategy.get_delay(attempt))
+                    with self._retry_lock:
+                        self.rate_limited_count += 1
+                    if (
+                        retry.should_retry(429, attempt)
+                        and self._wait_for_retry(attempt, deadline, response)
+                    ):
                         continue
                     raise RateLimitError("API 速率限制")
                 
                 # 其他錯誤
-                if self.retry_strategy.should_retry(response.status_code, attempt):
-                    time.sleep(self.retry_strategy.get_delay(attempt))
+                if (
+                    retry.should_retry(response.status_code, attempt)
+                    and self._wait_for_retry(attempt, deadline, response)
+                ):
                     continue
                 
                 raise APIError(
@@ -269,17 +546,43 @@ class OpenNotebookClient:
                 )
                 
             except requests.Timeout:
-                if self.retry_strategy.should_retry(None, attempt):
-                    time.sleep(self.retry_strategy.get_delay(attempt))
+                if retry.should_retry(None, attempt) and self._wait_for_retry(attempt, deadline):
                     continue
                 raise APIError("請求超時")
             
             except requests.RequestException as e:
-                if self.retry_strategy.should_retry(None, attempt):
-                    time.sleep(self.retry_strategy.get_delay(attempt))
+                if retry.should_retry(None, attempt) and self._wait_for_retry(attempt, deadline):
                     continue
                 raise APIError(f"請求失敗: {e}")
     
+    def _wait_for_retry(
+        self,
+        attempt: int,
+        deadline: float | None,
+        response: requests.Response | None = None
+    ) -> bool:
+        """
+        重試前等待，等待時間不超過剩餘的時間預算
+        
+        Args:
+            attempt: 當前嘗試次數
+            deadline: time.monotonic() 的截止時間，None 表示不限制
+            response: 觸發重試的回應（用於讀取 Retry-After）
+            
+        Returns:
+            True 表示已等待、可以重試；False 表示時間預算已用完
+        """
+        delay = self.retry_strategy.get_delay(attempt, response)
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            delay = min(delay, remaining)
+        with self._retry_lock:
+            self.retry_count += 1
+        time.sleep(delay)
+        return True
+    
     def health_check(self) -> bool:
         """
         健康檢查
@@ -291,7 +594,7 @@ class OpenNotebookClient:
         """
         try:
             response = self.session.get(
-                urljoin(self.config.base_url, "/health"),
+                self._url("/health"),
                 timeout=5
             )
             return response.status_code == 200
@@ -323,11 +626,14 @@ class OpenNotebookClient:
             "content": request.content,
             "embed": request.embed
         }
+        if request.topics is not None:
+            data["topics"] = request.topics
         
         result = self._make_request("POST", "/api/sources/json", json=data)
         
+        raw_id = result.get("id")
         return SourceCreateResponse(
-            id=result.get("id", ""),
+            id=SourceId(raw_id) if raw_id else "",
             title=result.get("title", ""),
             content=result.get("full_text", ""),
             created_at=result.get("created", "")
@@ -343,8 +649,8 @@ class OpenNotebookClient:
         
         呼叫 PUT /api/sources/{id}
         
-        ⚠️ 注意：topics 必須在建立後用 PUT 更新，
-        無法在 create_source 時一起設定。
+        ⚠️ 注意：目前的 Open Notebook 版本 topics 必須在建立後用 PUT 更新，
+        無法在 create_source 時一起設定（支援時見 supports_topics_on_create）。
         
         Args:
             source_id: Source ID（格式: "source:xxxxx"）
@@ -357,9 +663,7 @@ class OpenNotebookClient:
         data = {"topics": request.topics}
         
         # API 需要完整 ID (含 source: 前綴)
-        # 確保 source_id 有前綴
-        if not source_id.startswith("source:"):
-            source_id = f"source:{source_id}"
+        source_id = SourceId(source_id)
         
         self._make_request("PUT", f"/api/sources/{source_id}", json=data)
     
@@ -382,12 +686,9 @@ class OpenNotebookClient:
             NotebookNotFoundError: Notebook 不存在
             SourceNotFoundError: Source 不存在
         """
-        # API 需要完整 ID (含前綴)
-        if not source_id.startswith("source:"):
-            source_id = f"source:{source_id}"
-        
-        if not notebook_id.startswith("notebook:"):
-            notebook_id = f"notebook:{notebook_id}"
+        # API 需要完整 ID (含前綴)；已是 SourceId/NotebookId 時不會重新配置字串
+        source_id = SourceId(source_id)
+        notebook_id = NotebookId(notebook_id)
         
         self._make_request(
             "POST",
@@ -400,26 +701,40 @@ class OpenNotebookClient:
         
         若 Notebook 不存在則建立，回傳 Notebook ID。
         
+        Notebook 列表只在首次呼叫時取得一次，之後以名稱查詢本地快取；
+        若 Notebook 在外部被刪除，呼叫 invalidate_notebook_cache() 後重新查詢。
+        
         Args:
             notebook_name: Notebook 名稱
             
         Returns:
             Notebook ID
         """
+        notebook_id = self._notebook_id_cache.get(notebook_name)
+        if notebook_id is not None:
+            return notebook_id
+        
         try:
-            # 嘗試取得 Notebook 列表
-            response = self._make_request("GET", "/api/notebooks")
-            
-            # API 直接回傳 list，不是 dict
-            if isinstance(response, list):
-                notebooks = response
-            else:
-                notebooks = response.get("notebooks", [])
-            
-            # 尋找是否存在
-            for notebook in notebooks:
-                if notebook.get("name") == notebook_name:
-                    return notebook.get("id")
+            if not self._notebook_list_loaded:
+                # 嘗試取得 Notebook 列表
+                response = self._make_request("GET", "/api/notebooks")
+                
+                # API 直接回傳 list，不是 dict
+                if isinstance(response, list):
+                    notebooks = response
+                else:
+                    notebooks = response.get("notebooks", [])
+                
+                self._notebook_id_cache.update({
+                    notebook["name"]: NotebookId(notebook["id"])
+                    for notebook in notebooks
+                    if notebook.get("name") is not None and notebook.get("id") is not None
+                })
+                self._notebook_list_loaded = True
+                
+                notebook_id = self._notebook_id_cache.get(notebook_name)
+                if notebook_id is not None:
+                    return notebook_id
             
             # 不存在則建立
             create_response = self._make_request(
@@ -427,12 +742,45 @@ class OpenNotebookClient:
                 "/api/notebooks",
                 json={"name": notebook_name}
             )
-            return create_response.get("id")
+            notebook_id = create_response.get("id")
+            if notebook_id is not None:
+                notebook_id = NotebookId(notebook_id)
+                self._notebook_id_cache[notebook_name] = notebook_id
+            return notebook_id
             
         except APIError:
-            # 如果 API 不支援，假設 Notebook 已存在
+            # 如果 API 不支援，假設 Notebook 已存在（不快取，下次仍會重試）
             return notebook_name
     
+    def ensure_notebooks_exist(self, notebook_names: set[str]) -> dict[str, str]:
+        """
+        批次確保多個 Notebook 存在
+        
+        共用一次 Notebook 列表查詢，只對不存在的名稱各發一次建立請求。
+        
+        Args:
+            notebook_names: Notebook 名稱集合
+            
+        Returns:
+            Notebook 名稱 -> Notebook ID
+        """
+        return {name: self.ensure_notebook_exists(name) for name in notebook_names}
+    
+    def invalidate_notebook_cache(self, notebook_name: str | None = None) -> None:
+        """
+        清除 Notebook ID 快取
+        
+        Args:
+            notebook_name: 要清除的 Notebook 名稱；None 表示清除全部並重新取得列表
+        """
+        if notebook_name is None:
+            self._notebook_id_cache.clear()
+            self._notebook_list_loaded = False
+        else:
+            # 同時重新取得列表：ID 失效可能是 Notebook 被外部重建，先以名稱查詢再決定是否建立
+            self._notebook_id_cache.pop(notebook_name, None)
+            self._notebook_list_loaded = False
+    
     def trigger_embedding(self, source_id: str) -> None:
         """
         觸發 Source 嵌入 (Embedding)
@@ -449,8 +797,7 @@ class OpenNotebookClient:
             SourceNotFoundError: Source 不存在
         """
         # 確保 source_id 有前綴
-        if not source_id.startswith("source:"):
-            source_id = f"source:{source_id}"
+        source_id = SourceId(source_id)
         
         # 呼叫正確的嵌入端點
         try:
@@ -487,8 +834,7 @@ class OpenNotebookClient:
             API 回應（包含 status, message, command_id）
         """
         # 確保 source_id 有前綴
-        if not source_id.startswith("source:"):
-            source_id = f"source:{source_id}"
+        source_id = SourceId(source_id)
         
         data = {"transformation_id": transformation_id}
         if model_id:
@@ -515,10 +861,39 @@ class OpenNotebookClient:
             Transformation 列表
         """
         try:
-            result = self._make_request("GET", "/api/transformations")
-            return result if isinstance(result, list) else []
+            result = self._cached_get("/api/transformations")
+            return list(result) if isinstance(result, list) else []
         except APIError:
             return []
+    
+    def _cached_get(self, endpoint: str) -> Any:
+        """
+        執行 GET 請求並快取回應（僅用於執行期間幾乎不變的無參數端點）
+        
+        回應在 GET_CACHE_TTL 秒內重用；錯誤不快取。
+        
+        Args:
+            endpoint: API 端點（不含 base_url）
+            
+        Returns:
+            回應 JSON
+        """
+        now = time.monotonic()
+        cached = self._get_cache.get(endpoint)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        
+        result = self._make_request("GET", endpoint)
+        self._get_cache[endpoint] = (now + self.GET_CACHE_TTL, result)
+        return result
+    
+    def clear_get_cache(self) -> None:
+        """清除 GET 回應快取"""
+        self._get_cache.clear()
+    
+    def close(self) -> None:
+        """關閉 HTTP session 與其連線池"""
+        self.session.close()
 
 
 # ============================================================================
@@ -535,7 +910,10 @@ class SourceBuilder:
     def build_create_request(
         self,
         analyzed: AnalyzedTranscript,
-        file_path: Path | None = None
+        file_path: Path | None = None,
+        body: str | None = None,
+        include_topics: bool = False,
+        embed: bool = False
     ) -> SourceCreateRequest:
         """
         建構建立 Source 請求
@@ -543,6 +921,9 @@ class SourceBuilder:
         Args:
             analyzed: 分析完成的轉錄資料
             file_path: 分析後檔案路徑（若提供，從此檔案讀取內容）
+            body: 呼叫端已持有的正文（若提供，不再讀取檔案）
+            include_topics: 是否在建立請求中一併帶入 topics（服務端需支援）
+            embed: 是否由服務端在建立時一併嵌入（預設 False，稍後手動觸發）
             
         Returns:
             SourceCreateRequest
@@ -550,8 +931,9 @@ class SourceBuilder:
         return SourceCreateRequest(
             type="text",
             title=self.build_title(analyzed),
-            content=self.build_content(analyzed, file_path),
-            embed=False  # 稍後手動觸發
+            content=self.build_content(analyzed, file_path, body=body),
+            embed=embed,
+            topics=self.build_update_request(analyzed).topics if include_topics else None
         )
     
     def build_update_request(
@@ -567,13 +949,13 @@ class SourceBuilder:
         Returns:
             SourceUpdateRequest
         """
-        topics = analyzed.analysis.key_topics.copy()
+        analysis = analyzed.analysis
+        topics = analysis.key_topics
         
-        # 加入建議的主題
-        if analyzed.analysis.suggested_topic:
-            suggested = analyzed.analysis.suggested_topic
-            if suggested not in topics:
-                topics.insert(0, suggested)
+        # 加入建議的主題（放在最前面；需要時才建立新列表）
+        suggested = analysis.suggested_topic
+        if suggested and suggested not in topics:
+            topics = [suggested, *topics]
         
         return SourceUpdateRequest(topics=topics)
     
@@ -590,21 +972,18 @@ class SourceBuilder:
             標題字串
         """
         original = analyzed.original
-        published_at = original.published_at.isoformat()
+        published_at = original.published_iso
         return f"{original.channel} | {original.title} | {published_at}"
     
-    def build_content(self, analyzed: AnalyzedTranscript, file_path: Path | None = None) -> str:
+    def _frontmatter_dict(self, analyzed: AnalyzedTranscript) -> dict[str, Any]:
         """
-        建構 Source 內容
-        
-        包含完整的 frontmatter YAML + 轉錄內容。
+        建構上傳內容用的 frontmatter 字典
         
         Args:
             analyzed: 分析完成的轉錄資料
-            file_path: 分析後檔案路徑（若提供，從此檔案讀取內容）
             
         Returns:
-            內容字串
+            可序列化為 YAML 的字典
         """
         original = analyzed.original
         analysis = analyzed.analysis
@@ -616,7 +995,7 @@ class SourceBuilder:
             "channel": original.channel,
             "video_id": original.video_id,
             "title": original.title,
-            "published_at": original.published_at.isoformat(),
+            "published_at": original.published_iso,
             "duration": original.duration,
             "word_count": original.word_count,
             
@@ -634,47 +1013,350 @@ class SourceBuilder:
             frontmatter["dialogue_format"] = analysis.dialogue_format
         
         if analysis.segments:
-            frontmatter["segments"] = [
-                {
-                    "section_type": s.section_type,
-                    "title": s.title,
-                    "start_quote": s.start_quote
-                }
-                for s in analysis.segments
-            ]
+            # Segment 為僅含 section_type/title/start_quote 的扁平 dataclass，
+            # 直接複製實例 __dict__ 即等同 asdict()，省去逐欄位組 dict
+            frontmatter["segments"] = [dict(vars(s)) for s in analysis.segments]
         
         if analysis.key_entities:
             frontmatter["key_entities"] = analysis.key_entities
         
         # 處理中繼資料
         frontmatter["analyzed_by"] = processing.analyzed_by
-        frontmatter["analyzed_at"] = processing.analyzed_at.isoformat()
+        frontmatter["analyzed_at"] = processing.analyzed_iso
         frontmatter["pipeline_version"] = processing.pipeline_version
         frontmatter["source_path"] = processing.source_path
         
+        return frontmatter
+    
+    def build_content(
+        self,
+        analyzed: AnalyzedTranscript,
+        file_path: Path | None = None,
+        body: str | None = None
+    ) -> str:
+        """
+        建構 Source 內容
+        
+        包含完整的 frontmatter YAML + 轉錄內容。
+        
+        Args:
+            analyzed: 分析完成的轉錄資料
+            file_path: 分析後檔案路徑（若提供，從此檔案讀取內容）
+            body: 呼叫端已持有的正文（若提供，不再讀取檔案）
+            
+        Returns:
+            內容字串
+        """
+        frontmatter = self._frontmatter_dict(analyzed)
+        
         # 序列化 YAML
         yaml_content = yaml.dump(
             frontmatter,
+            Dumper=YamlSafeDumper,
             allow_unicode=True,
             sort_keys=False,
             default_flow_style=False
         )
         
-        # 讀取內容 - 優先從提供的 file_path 讀取，否則回退到 source_path
-        content = ""
-        content_source = file_path if file_path else Path(processing.source_path)
-        if content_source and content_source.exists():
+        # 讀取內容 - 優先使用呼叫端提供的正文，其次從 file_path 讀取，否則回退到 source_path
+        content = body
+        if content is None:
+            content_source = file_path if file_path else Path(analyzed.processing.source_path)
             try:
                 from src.discovery import FrontmatterParser
-                _, content = FrontmatterParser().parse_file(content_source)
+                content = FrontmatterParser().parse_file_body(content_source)
             except Exception:
-                pass
+                # 檔案不存在或無法讀取
+                content = ""
         
-        return f"""---
-{yaml_content}---
+        # 一次算出總長度後複製各片段，不產生中間字串
+        return "".join(("---\n", yaml_content, "---\n\n", content, "\n"))
 
-{content}
-"""
+
+# ============================================================================
+# Uploader 輔助函式
+# ============================================================================
+
+# 自動偵測時的優先順序：Key Insights > Simple Summary > Dense Summary > 第一個可用
+_INSIGHT_PRIORITY = ("Key Insights", "Simple Summary", "Dense Summary")
+
+# 解析結果的共用時間（秒）；查無 transformation 或端點失敗時較短，服務端修復後能較快恢復
+_TRANSFORMATION_CACHE_TTL = 600.0
+_TRANSFORMATION_EMPTY_TTL = 60.0
+# 等待其他呼叫端查詢結果的上限（秒）
+_TRANSFORMATION_WAIT_TIMEOUT = 120.0
+
+# base_url -> (到期時間, transformation IDs)；同一行程內的所有 UploaderService 共用
+_transformation_cache: dict[str, tuple[float, list[str]]] = {}
+# base_url -> 查詢中的 Future；同一服務端同時只發一次查詢，其餘呼叫端等待結果
+_transformation_pending: dict[str, Future] = {}
+_transformation_cache_lock = threading.Lock()
+
+
+def _content_digest(request: SourceCreateRequest) -> str:
+    """
+    計算 Source 請求內容的摘要（供上傳去重使用）
+    
+    Args:
+        request: 建立 Source 請求
+        
+    Returns:
+        16 bytes blake2b 十六進位字串
+    """
+    digest = hashlib.blake2b(request.title.encode("utf-8"), digest_size=16)
+    digest.update(b"\0")
+    digest.update(request.content.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _resolve_transformation_ids(client: OpenNotebookClient) -> list[str]:
+    """
+    自動選擇要執行的 transformation
+    
+    結果以服務端 base_url 為鍵在行程內快取，查無任何 transformation（含端點不存在或失敗）
+    也會快取較短的時間。查詢在鎖外進行，同時到達的呼叫端共用同一次查詢。
+    
+    Args:
+        client: Open Notebook 客戶端
+        
+    Returns:
+        transformation ID 列表（至多一個）
+    """
+    key = client.config.base_url
+    with _transformation_cache_lock:
+        cached = _transformation_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        
+        future = _transformation_pending.get(key)
+        owner = future is None
+        if owner:
+            future = _transformation_pending[key] = Future()
+    
+    if not owner:
+        # 查詢的呼叫端本身受重試總時間限制；此處另設上限，避免異常情況下無限等待
+        return future.result(timeout=_TRANSFORMATION_WAIT_TIMEOUT)
+    
+    try:
+        transformations = client.get_transformations()
+        
+        # 名稱 -> ID 只建一次，之後依優先順序 O(1) 查詢；
+        # 反向建立讓同名項目保留列表中第一個出現的 ID
+        by_name = {t.get("name"): t.get("id") for t in reversed(transformations)}
+        chosen = next((by_name[name] for name in _INSIGHT_PRIORITY if name in by_name), None)
+        if chosen is None and transformations:
+            # 如果都沒找到，使用第一個
+            chosen = transformations[0].get("id")
+        trans_ids = [chosen] if chosen else []
+        
+        ttl = _TRANSFORMATION_CACHE_TTL if trans_ids else _TRANSFORMATION_EMPTY_TTL
+        with _transformation_cache_lock:
+            _transformation_cache[key] = (time.monotonic() + ttl, trans_ids)
+    except BaseException as e:
+        # 任何失敗（含回應格式不符）都必須解除等待中的呼叫端
+        future.set_exception(e)
+        raise
+    finally:
+        with _transformation_cache_lock:
+            _transformation_pending.pop(key, None)
+    
+    future.set_result(trans_ids)
+    return trans_ids
+
+
+class _ConcurrencyController:
+    """
+    上傳並行數控制器（AIMD）
+    
+    每段上傳結束後回報平均耗時與是否遇到 429：
+    - 遇到 429：並行數減半（乘法遞減）
+    - 耗時未明顯上升（不超過 EMA 的 tolerance 倍）：並行數加一（加法遞增）
+    - 其他情況維持不變
+    """
+    
+    def __init__(
+        self,
+        ceiling: int,
+        initial: int = 2,
+        alpha: float = 0.3,
+        tolerance: float = 1.2
+    ):
+        """
+        初始化控制器
+        
+        Args:
+            ceiling: 並行數上限
+            initial: 初始並行數
+            alpha: 耗時 EMA 的平滑係數
+            tolerance: 耗時相對 EMA 的容許上升比例
+        """
+        self.ceiling = max(1, ceiling)
+        self.workers = min(initial, self.ceiling)
+        self.alpha = alpha
+        self.tolerance = tolerance
+        self.ema_duration_ms: float | None = None
+    
+    def update(self, duration_ms: float, rate_limited: bool) -> int:
+        """
+        依本段結果調整並行數
+        
+        Args:
+            duration_ms: 本段每筆的平均耗時（毫秒）
+            rate_limited: 本段是否收到 429
+            
+        Returns:
+            下一段使用的並行數
+        """
+        ema = self.ema_duration_ms
+        if rate_limited:
+            self.workers = max(1, self.workers // 2)
+        elif ema is None or duration_ms <= ema * self.tolerance:
+            self.workers = min(self.ceiling, self.workers + 1)
+        
+        self.ema_duration_ms = (
+            duration_ms if ema is None else self.alpha * duration_ms + (1 - self.alpha) * ema
+        )
+        return self.workers
+
+
+class _PermitGate:
+    """
+    可調整上限的許可閘門
+    
+    執行緒池固定開到上限，實際同時上傳的筆數由此閘門控制；調整上限不需重建執行緒池，
+    調降時已在進行中的上傳照常完成，之後才不再放行。
+    """
+    
+    def __init__(self, limit: int):
+        """
+        初始化閘門
+        
+        Args:
+            limit: 同時持有許可的上限
+        """
+        self.limit = max(1, limit)
+        self._active = 0
+        self._condition = threading.Condition()
+    
+    def resize(self, limit: int) -> None:
+        """調整許可上限"""
+        with self._condition:
+            self.limit = max(1, limit)
+            self._condition.notify_all()
+    
+    def __enter__(self) -> _PermitGate:
+        with self._condition:
+            self._condition.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        with self._condition:
+            self._active -= 1
+            self._condition.notify()
+
+
+# ============================================================================
+# Upload Journal
+# ============================================================================
+
+class UploadJournal:
+    """
+    上傳日誌（sqlite）
+    
+    以 (內容摘要, Notebook 名稱) 為鍵記錄每筆上傳的狀態（pending / committed / failed），
+    程式中斷後重新執行時，已 committed 的項目直接沿用既有 Source ID，不再重新上傳。
+    
+    每次寫入各自提交（autocommit + WAL），可安全地在多個執行緒間共用。
+    """
+    
+    def __init__(self, path: Path):
+        """
+        開啟（或建立）日誌資料庫
+        
+        Args:
+            path: sqlite 檔案路徑
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS uploads ("
+                " content_hash TEXT NOT NULL,"
+                " notebook TEXT NOT NULL,"
+                " source_id TEXT,"
+                " state TEXT NOT NULL,"
+                " error TEXT,"
+                " ts REAL NOT NULL,"
+                " PRIMARY KEY (content_hash, notebook))"
+            )
+    
+    def committed_source_id(self, content_hash: str, notebook: str) -> str | None:
+        """
+        查詢已完成上傳的 Source ID
+        
+        Args:
+            content_hash: 內容摘要
+            notebook: Notebook 名稱
+            
+        Returns:
+            Source ID；尚未完成上傳時回傳 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT source_id FROM uploads"
+                " WHERE content_hash = ? AND notebook = ? AND state = 'committed'",
+                (content_hash, notebook)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def mark_pending(self, content_hash: str, notebook: str) -> None:
+        """記錄開始上傳"""
+        self._record(content_hash, notebook, "pending")
+    
+    def mark_committed(self, content_hash: str, notebook: str, source_id: str) -> None:
+        """記錄上傳完成與 Source ID"""
+        self._record(content_hash, notebook, "committed", source_id=str(source_id))
+    
+    def mark_failed(self, content_hash: str, notebook: str, error: str) -> None:
+        """記錄上傳失敗與錯誤訊息"""
+        self._record(content_hash, notebook, "failed", error=error)
+    
+    def close(self) -> None:
+        """關閉資料庫連線"""
+        with self._lock:
+            self._conn.close()
+    
+    def _record(
+        self,
+        content_hash: str,
+        notebook: str,
+        state: str,
+        source_id: str | None = None,
+        error: str | None = None
+    ) -> None:
+        """
+        寫入（或覆寫）單筆狀態
+        
+        Args:
+            content_hash: 內容摘要
+            notebook: Notebook 名稱
+            state: pending / committed / failed
+            source_id: Source ID
+            error: 錯誤訊息
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO uploads (content_hash, notebook, source_id, state, error, ts)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (content_hash, notebook) DO UPDATE SET"
+                " source_id = excluded.source_id, state = excluded.state,"
+                " error = excluded.error, ts = excluded.ts",
+                (content_hash, notebook, source_id, state, error, time.time())
+            )
 
 
 # ============================================================================
@@ -688,12 +1370,16 @@ class UploaderService:
     整合 API 客戶端與請求建構，提供高階上傳 API。
     """
     
+    # 內容去重快取的最大筆數
+    DEDUP_CACHE_SIZE = 4096
+    
     def __init__(
         self,
         client: OpenNotebookClient,
         builder: SourceBuilder | None = None,
         auto_insights: bool = True,
-        transformation_ids: list[str] | None = None
+        transformation_ids: list[str] | None = None,
+        journal: UploadJournal | None = None
     ):
         """
         初始化上傳服務
@@ -703,19 +1389,61 @@ class UploaderService:
             builder: Source 請求建構器
             auto_insights: 是否在上傳後自動生成 insights（預設 True）
             transformation_ids: 要執行的 transformation ID 列表，None 表示自動偵測
+            journal: 上傳日誌（可選，提供時中斷後重新執行可跳過已完成的項目）
         """
         self.client = client
         self.builder = builder or SourceBuilder()
         self._stats = UploadStatistics()
         self.auto_insights = auto_insights
         self.transformation_ids = transformation_ids
-        self._cached_transformations: list[str] | None = None
+        self.journal = journal
+        
+        # upload() 可能在多個執行緒中並行呼叫
+        self._stats_lock = threading.Lock()
+        self._notebook_lock = threading.Lock()
+        
+        # (notebook_name, 內容摘要) -> Source ID，最近使用的排在最後
+        self._uploaded_sources: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._dedup_lock = threading.Lock()
+        
+        # 同一 Source 內互不相依的 API 呼叫以此執行緒池重疊執行；每個並行上傳
+        # 可能同時佔用一個工作執行緒，故與連線池同大小，避免 link 請求排隊
+        self._request_executor = ThreadPoolExecutor(
+            max_workers=max(4, client.pool_maxsize),
+            thread_name_prefix="on-request"
+        )
+        
+        # Insights 於背景執行，upload() 不等待；與上方執行緒池分開，避免長時間的
+        # insight 請求佔滿 link 等待中的工作執行緒
+        self._insight_pool = ThreadPoolExecutor(
+            max_workers=4,
+            thread_name_prefix="insights"
+        )
+    
+    def close(self) -> None:
+        """
+        關閉背景執行緒池與上傳日誌
+        
+        等待已送出的 insight 請求完成後才返回，避免結束時遺失背景工作。
+        """
+        self._insight_pool.shutdown(wait=True)
+        self._request_executor.shutdown(wait=True)
+        if self.journal is not None:
+            self.journal.close()
+    
+    def __enter__(self) -> UploaderService:
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
     
     def upload(
         self,
         analyzed: AnalyzedTranscript,
         notebook_name: str,
-        file_path: Path | None = None
+        file_path: Path | None = None,
+        body: str | None = None,
+        notebook_id: str | None = None
     ) -> str:
         """
         上傳單個分析結果
@@ -723,13 +1451,16 @@ class UploaderService:
         完整流程：
         1. 確保 Notebook 存在
         2. 建立 Source
-        3. 更新 Topics
+        3. 更新 Topics（與步驟 4 並行）
         4. 關聯 Notebook
+        5. 觸發嵌入（服務端於建立時嵌入則略過）
         
         Args:
             analyzed: 分析完成的轉錄資料
             notebook_name: 目標 Notebook 名稱
             file_path: 分析後檔案路徑（用於讀取清理後的內容）
+            body: 呼叫端已持有的正文（若提供，不再讀取檔案）
+            notebook_id: 已解析的 Notebook ID（若提供，略過步驟 1）
             
         Returns:
             Source ID（格式: "source:xxxxx"）
@@ -737,71 +1468,277 @@ class UploaderService:
         Raises:
             UploadError: 上傳過程中發生錯誤（已重試後仍失敗）
         """
-        self._stats.total_uploaded += 1
-        start_time = time.time()
+        # 內容與目標 Notebook 皆相同的 Source 已上傳過（本行程或日誌記錄），直接沿用
+        topics_on_create = self.client.supports_topics_on_create
+        # 嵌入需包含 topics，只有 topics 隨建立請求送出時才能交由服務端在建立時嵌入
+        embed_on_create = topics_on_create and self.client.embeds_on_create
+        create_request = self.builder.build_create_request(
+            analyzed, file_path, body=body,
+            include_topics=topics_on_create, embed=embed_on_create
+        )
+        content_hash = _content_digest(create_request)
+        dedup_key = (notebook_name, content_hash)
+        with self._dedup_lock:
+            cached_id = self._uploaded_sources.get(dedup_key)
+            if cached_id is not None:
+                self._uploaded_sources.move_to_end(dedup_key)
+        if cached_id is None and self.journal is not None:
+            cached_id = self.journal.committed_source_id(content_hash, notebook_name)
+            if cached_id is not None:
+                self._remember_upload(dedup_key, SourceId(cached_id))
+        if cached_id is not None:
+            with self._stats_lock:
+                self._stats.cache_hits += 1
+            return cached_id
+        
+        with self._stats_lock:
+            self._stats.total_uploaded += 1
+        # 單調時鐘（整數奈秒），不受系統時間調整影響
+        start_ns = time.perf_counter_ns()
+        
+        if self.journal is not None:
+            self.journal.mark_pending(content_hash, notebook_name)
         
         try:
-            # Step 1: 確保 Notebook 存在
-            notebook_id = self.client.ensure_notebook_exists(notebook_name)
+            # Step 1: 確保 Notebook 存在（序列化，避免並行時重複建立同名 Notebook）
+            if notebook_id is None:
+                with self._notebook_lock:
+                    notebook_id = self.client.ensure_notebook_exists(notebook_name)
             
             # Step 2: 建立 Source（從分析後檔案讀取內容）
-            create_request = self.builder.build_create_request(analyzed, file_path)
-            create_response = self.client.create_source(create_request)
-            source_id = create_response.id
-            
-            # Step 3: 更新 Topics
-            update_request = self.builder.build_update_request(analyzed)
-            self.client.update_source_topics(source_id, update_request)
+            # 請求內容與回應的 full_text 都是整份逐字稿，只取 ID，
+            # 讓兩份大字串在後續往返期間即可釋放
+            source_id = self.client.create_source(create_request).id
+            del create_request
             
-            # Step 4: 關聯 Notebook
-            self.client.link_source_to_notebook(notebook_id, source_id)
+            # Step 3 & 4: 關聯 Notebook 與更新 Topics 互不相依，重疊兩次往返；
+            # topics 已在建立時帶入則略過步驟 3
+            if topics_on_create:
+                self._link_to_notebook(notebook_name, notebook_id, source_id)
+            else:
+                link_future = self._request_executor.submit(
+                    self._link_to_notebook, notebook_name, notebook_id, source_id
+                )
+                try:
+                    update_request = self.builder.build_update_request(analyzed)
+                    self.client.update_source_topics(source_id, update_request)
+                finally:
+                    # Topics 更新失敗時仍須等待 link 結束，避免背景請求脫離此次上傳
+                    wait([link_future])
+                link_future.result()
             
-            # Step 5: 觸發嵌入
-            self.client.trigger_embedding(source_id)
+            # Step 5: 觸發嵌入（需在 Topics 更新後；服務端已於建立時嵌入則略過）
+            if not embed_on_create:
+                self.client.trigger_embedding(source_id)
             
             # Step 6: 自動生成 Insights（背景執行，不等待結果）
             if self.auto_insights:
                 self._trigger_insights_async(source_id)
             
             # 更新統計
-            self._stats.successful += 1
-            duration_ms = (time.time() - start_time) * 1000
-            self._update_avg_duration(duration_ms)
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
+            with self._stats_lock:
+                self._stats.successful += 1
+                self._update_avg_duration(duration_ms)
+            
+            self._remember_upload(dedup_key, source_id)
+            if self.journal is not None:
+                self.journal.mark_committed(content_hash, notebook_name, source_id)
             
             return source_id
             
         except APIError as e:
-            self._stats.failed += 1
+            with self._stats_lock:
+                self._stats.failed += 1
+            if self.journal is not None:
+                self.journal.mark_failed(content_hash, notebook_name, str(e))
             raise UploadError(f"上傳失敗: {e}") from e
     
+    def resolve_notebooks(self, notebook_names: set[str]) -> dict[str, str]:
+        """
+        一次解析（必要時建立）多個 Notebook
+        
+        批次上傳前呼叫，結果傳給 upload(notebook_id=...) 後各筆不再各自查詢。
+        
+        Args:
+            notebook_names: Notebook 名稱集合
+            
+        Returns:
+            Notebook 名稱 -> Notebook ID
+        """
+        with self._notebook_lock:
+            return self.client.ensure_notebooks_exist(notebook_names)
+    
+    def _link_to_notebook(self, notebook_name: str, notebook_id: str, source_id: str) -> None:
+        """
+        將 Source 關聯至 Notebook，快取的 Notebook ID 已失效時重新解析並重試一次
+        
+        Notebook 在外部被刪除或重建後，快取的 ID 會回應 404；清除該名稱的快取後
+        重新查詢（不存在則建立），不需重啟行程即可恢復。
+        
+        Args:
+            notebook_name: Notebook 名稱
+            notebook_id: 已解析的 Notebook ID
+            source_id: Source ID
+            
+        Raises:
+            APIError: API 呼叫失敗（含重試後仍找不到 Notebook）
+        """
+        try:
+            self.client.link_source_to_notebook(notebook_id, source_id)
+            return
+        except NotebookNotFoundError:
+            logger.warning("Notebook ID 已失效，重新查詢: %s (%s)", notebook_name, notebook_id)
+        
+        with self._notebook_lock:
+            self.client.invalidate_notebook_cache(notebook_name)
+            notebook_id = self.client.ensure_notebook_exists(notebook_name)
+        self.client.link_source_to_notebook(notebook_id, source_id)
+    
+    def _remember_upload(self, dedup_key: tuple[str, str], source_id: str) -> None:
+        """
+        將完成的上傳加入去重快取（超過上限時淘汰最久未使用的項目）
+        
+        Args:
+            dedup_key: (notebook_name, 內容摘要)
+            source_id: Source ID
+        """
+        with self._dedup_lock:
+            self._uploaded_sources[dedup_key] = source_id
+            if len(self._uploaded_sources) > self.DEDUP_CACHE_SIZE:
+                self._uploaded_sources.popitem(last=False)
+    
     def upload_batch(
         self,
-        analyzed_list: list[tuple[AnalyzedTranscript, str]]
+        analyzed_list: Sequence[
+            tuple[AnalyzedTranscript, str] | tuple[AnalyzedTranscript, str, Path | None]
+        ],
+        max_workers: int | None = None,
+        on_result: Callable[[int, UploadResult], None] | None = None
     ) -> list[UploadResult]:
         """
         批次上傳多個分析結果
         
+        上傳以網路往返為主，各筆以執行緒池並行上傳；統計資料由 upload() 內的鎖保護。
+        執行緒池固定開到上限，實際並行數由 AIMD 控制器依平均耗時與 429 次數調整
+        （每完成兩倍並行數的筆數調整一次），不會因等待單一慢速上傳而整批停頓。
+        
         Args:
-            analyzed_list: (AnalyzedTranscript, notebook_name) 元組列表
+            analyzed_list: (AnalyzedTranscript, notebook_name[, file_path]) 元組列表；
+                提供 file_path 時從該檔案讀取上傳內容
+            max_workers: 最大並行數，None 表示使用客戶端連線池大小
+            on_result: 每筆完成時於工作執行緒呼叫 (索引, 結果)，例如立即寫回檔案狀態
             
         Returns:
             UploadResult 列表（順序與輸入相同）
         """
-        results = []
+        if not analyzed_list:
+            return []
         
-        for analyzed, notebook_name in analyzed_list:
-            try:
-                source_id = self.upload(analyzed, notebook_name)
-                results.append(UploadResult(success=True, source_id=source_id))
-            except UploadError as e:
-                results.append(UploadResult(
-                    success=False,
-                    error=str(e),
-                    error_code="UPLOAD_ERROR"
-                ))
+        # 批次內通常只有少數幾個 Notebook，先一次解析完，各筆上傳不再各自查詢；
+        # 解析失敗時改由各筆 upload() 自行解析，錯誤記錄在各自的結果中而非中斷整批
+        try:
+            notebook_ids = self.resolve_notebooks({item[1] for item in analyzed_list})
+        except Exception as e:
+            logger.warning("批次解析 Notebook 失敗，改為逐筆解析: %s", e)
+            notebook_ids = {}
+        
+        # 並行數不超過連線池大小，避免執行緒等待或丟棄 keep-alive 連線
+        pool_size = self.client.pool_maxsize
+        ceiling = min(max_workers or pool_size, pool_size, len(analyzed_list))
+        
+        # 結果列表預先配置，各筆直接寫入對應位置
+        results: list[UploadResult] = [None] * len(analyzed_list)  # type: ignore[list-item]
+        
+        if ceiling <= 1:
+            for index, item in enumerate(analyzed_list):
+                results[index] = self._upload_result(item, notebook_ids.get(item[1]))
+                if on_result is not None:
+                    on_result(index, results[index])
+            return results
+        
+        controller = _ConcurrencyController(ceiling)
+        gate = _PermitGate(controller.workers)
+        pending = iter(enumerate(analyzed_list))
+        pending_lock = threading.Lock()
+        
+        # 自上次調整以來各筆的耗時與 429 計數基準，由 window_lock 保護
+        window_lock = threading.Lock()
+        durations: list[float] = []
+        rate_limited_before = self.client.rate_limited_count
+        
+        def record(duration_ms: float) -> None:
+            nonlocal rate_limited_before
+            with window_lock:
+                durations.append(duration_ms)
+                if len(durations) < gate.limit * 2:
+                    return
+                rate_limited_now = self.client.rate_limited_count
+                workers = controller.update(
+                    sum(durations) / len(durations),
+                    rate_limited_now > rate_limited_before
+                )
+                durations.clear()
+                rate_limited_before = rate_limited_now
+            gate.resize(workers)
+        
+        def worker() -> None:
+            while True:
+                with pending_lock:
+                    entry = next(pending, None)
+                if entry is None:
+                    return
+                index, item = entry
+                with gate:
+                    start_ns = time.perf_counter_ns()
+                    result = self._upload_result(item, notebook_ids.get(item[1]))
+                    duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
+                results[index] = result
+                record(duration_ms)
+                if on_result is not None:
+                    on_result(index, result)
+        
+        with ThreadPoolExecutor(
+            max_workers=ceiling,
+            thread_name_prefix="on-upload"
+        ) as executor:
+            futures = [executor.submit(worker) for _ in range(ceiling)]
+        # 重新拋出 on_result 等非上傳錯誤
+        for future in futures:
+            future.result()
         
         return results
     
+    def _upload_result(
+        self,
+        item: tuple[AnalyzedTranscript, str] | tuple[AnalyzedTranscript, str, Path | None],
+        notebook_id: str | None = None
+    ) -> UploadResult:
+        """
+        上傳單筆並轉換為 UploadResult（供 upload_batch 使用）
+        
+        Args:
+            item: (AnalyzedTranscript, notebook_name[, file_path]) 元組
+            notebook_id: 已解析的 Notebook ID
+            
+        Returns:
+            UploadResult
+        """
+        analyzed, notebook_name, *rest = item
+        file_path = rest[0] if rest else None
+        try:
+            source_id = self.upload(
+                analyzed, notebook_name, file_path, notebook_id=notebook_id
+            )
+            return UploadResult(success=True, source_id=source_id)
+        except Exception as e:
+            # 讀檔等非 API 錯誤同樣只影響這一筆，不中斷整批上傳
+            return UploadResult(
+                success=False,
+                error_code="UPLOAD_ERROR",
+                exc=e
+            )
+    
     def get_statistics(self) -> UploadStatistics:
         """
         取得上傳統計資訊
@@ -809,22 +1746,22 @@ class UploaderService:
         Returns:
             上傳過程的統計資料
         """
+        # 重試發生在 client 層，取用時才同步
+        self._stats.retried = self.client.retry_count
         return self._stats
     
     def _update_avg_duration(self, duration_ms: float) -> None:
         """
         更新平均耗時
         
+        呼叫端須持有 _stats_lock，且 successful 已包含本次。
+        以增量平均（Welford）更新，不需將平均值乘回總和，n 很大時也不會累積誤差。
+        
         Args:
             duration_ms: 本次耗時（毫秒）
         """
-        n = self._stats.successful
-        if n == 1:
-            self._stats.avg_duration_ms = duration_ms
-        else:
-            self._stats.avg_duration_ms = (
-                (self._stats.avg_duration_ms * (n - 1) + duration_ms) / n
-            )
+        stats = self._stats
+        stats.avg_duration_ms += (duration_ms - stats.avg_duration_ms) / stats.successful
     
     def _trigger_insights_async(self, source_id: str) -> None:
         """
@@ -834,6 +1771,8 @@ class UploaderService:
         - 若設定了 transformation_ids，使用指定的 IDs
         - 否則自動偵測可用的 transformation（優先使用 Key Insights）
         
+        要執行的 transformation 在呼叫端執行緒解析，背景工作只負責送出請求。
+        
         Args:
             source_id: Source ID
         """
@@ -842,28 +1781,25 @@ class UploaderService:
             trans_ids = self.transformation_ids
             
             if trans_ids is None:
-                # 自動偵測：快取並尋找 "Key Insights"
-                if self._cached_transformations is None:
-                    transformations = self.client.get_transformations()
-                    self._cached_transformations = []
-                    
-                    # 優先順序：Key Insights > Simple Summary > 第一個可用
-                    priority_names = ["Key Insights", "Simple Summary", "Dense Summary"]
-                    for priority in priority_names:
-                        for t in transformations:
-                            if t.get("name") == priority:
-                                self._cached_transformations.append(t.get("id"))
-                                break
-                        if self._cached_transformations:
-                            break
-                    
-                    # 如果都沒找到，使用第一個
-                    if not self._cached_transformations and transformations:
-                        self._cached_transformations = [transformations[0].get("id")]
-                
-                trans_ids = self._cached_transformations
+                # 自動偵測：優先使用 "Key Insights"（同一服務端的結果於行程內共用）
+                trans_ids = _resolve_transformation_ids(self.client)
             
-            # 執行每個 transformation（不等待結果）
+            if trans_ids:
+                self._insight_pool.submit(self._run_insights, source_id, list(trans_ids))
+                
+        except Exception:
+            # 完全忽略 insights 相關錯誤，不影響上傳流程
+            pass
+    
+    def _run_insights(self, source_id: str, trans_ids: list[str]) -> None:
+        """
+        執行 transformation（於 _insight_pool 背景執行）
+        
+        Args:
+            source_id: Source ID
+            trans_ids: 要執行的 transformation ID 列表
+        """
+        try:
             for trans_id in trans_ids:
                 if trans_id:
                     result = self.client.create_insight(source_id, trans_id)